@@ -0,0 +1,15 @@
+"""Target price alerts and the sinks they are delivered to."""
+
+from .dispatch import dispatch_pending, get_sink, queue_alerts, set_sink
+from .sinks import AlertSink, LoggingSink, MemorySink, WebhookSink
+
+__all__ = [
+    "AlertSink",
+    "LoggingSink",
+    "MemorySink",
+    "WebhookSink",
+    "dispatch_pending",
+    "get_sink",
+    "queue_alerts",
+    "set_sink",
+]
@@ -0,0 +1,58 @@
+"""Queueing alerts on a session and delivering them once it commits."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas import PriceAlert
+
+from .sinks import AlertSink, LoggingSink, WebhookSink
+
+logger = logging.getLogger(__name__)
+
+# ``session.info`` key collecting alerts to deliver once the session commits.
+_PENDING_INFO_KEY = "pending_price_alerts"
+
+_sink: AlertSink | None = None
+
+
+def set_sink(sink: AlertSink | None) -> None:
+    """Replace the process-wide sink; ``None`` restores the one configured in settings."""
+
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> AlertSink:
+    """Return the process-wide sink: a webhook when ``alert_webhook_url`` is set, else the log."""
+
+    global _sink
+    if _sink is None:
+        _sink = WebhookSink(settings.alert_webhook_url) if settings.alert_webhook_url else LoggingSink()
+    return _sink
+
+
+def queue_alerts(session: AsyncSession, alerts: Iterable[PriceAlert]) -> None:
+    """Hold ``alerts`` on ``session`` until :func:`dispatch_pending` runs after its commit."""
+
+    session.info.setdefault(_PENDING_INFO_KEY, []).extend(alerts)
+
+
+async def dispatch_pending(session: AsyncSession) -> None:
+    """Send the alerts queued on ``session``; call right after it commits.
+
+    Delivery is at most once: the crossing is already recorded, so a failing sink
+    loses the batch rather than repeating it on the next check.
+    """
+
+    pending = session.info.pop(_PENDING_INFO_KEY, None)
+    if not pending:
+        return
+    try:
+        await get_sink().send(pending)
+    except Exception:  # pragma: no cover - defensive logging
+        logger.exception("Failed to deliver %s price alerts", len(pending))
@@ -0,0 +1,59 @@
+"""Destinations for target price alerts."""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import httpx
+
+from app.schemas import PriceAlert
+
+logger = logging.getLogger(__name__)
+
+
+class AlertSink(ABC):
+    """Receives alerts after the prices that triggered them are committed."""
+
+    @abstractmethod
+    async def send(self, alerts: Sequence[PriceAlert]) -> None:
+        """Deliver a batch of alerts; errors are logged by the caller and the batch dropped."""
+
+
+class LoggingSink(AlertSink):
+    """Writes each alert to the application log."""
+
+    async def send(self, alerts: Sequence[PriceAlert]) -> None:
+        for alert in alerts:
+            logger.info(
+                "Product %s reached its target: %s %s (target %s)",
+                alert.product_id,
+                alert.price,
+                alert.currency or "",
+                alert.target_price,
+            )
+
+
+class MemorySink(AlertSink):
+    """Keeps alerts in a list, standing in for a real destination in tests and local runs."""
+
+    def __init__(self) -> None:
+        self.sent: list[PriceAlert] = []
+
+    async def send(self, alerts: Sequence[PriceAlert]) -> None:
+        self.sent.extend(alerts)
+
+
+class WebhookSink(AlertSink):
+    """POSTs each batch to ``url`` as a JSON array."""
+
+    def __init__(self, url: str, *, timeout: float = 10.0) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, alerts: Sequence[PriceAlert]) -> None:
+        payload = [alert.model_dump(mode="json") for alert in alerts]
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(self.url, json=payload)
+            response.raise_for_status()
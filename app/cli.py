@@ -0,0 +1,89 @@
+"""Command line tools for bulk data transfers and maintenance.
+
+Usage::
+
+    python -m app.cli export ./dump
+    python -m app.cli import ./dump
+    python -m app.cli rebuild-stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app import columnar, crud
+from app.core import cache
+from app.core.config import settings
+from app.core.redis import close_redis
+from app.db.session import SessionLocal, async_engine
+
+
+def _report(results: list[columnar.TransferStats], started: float) -> None:
+    for stats in results:
+        print(stats)
+    total = columnar.TransferStats(
+        "total",
+        rows=sum(stats.rows for stats in results),
+        bytes=sum(stats.bytes for stats in results),
+        seconds=time.perf_counter() - started,
+    )
+    print(total)
+
+
+async def _rebuild_price_summaries() -> int:
+    try:
+        async with SessionLocal() as session:
+            rebuilt = await crud.rebuild_price_summaries(session, now=datetime.utcnow())
+            await session.commit()
+            await cache.invalidate_stale(session)
+            return rebuilt
+    finally:
+        await close_redis()
+        await async_engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write products and price history to Parquet files")
+    export.add_argument("directory", type=Path)
+    export.add_argument(
+        "--block-mb",
+        type=int,
+        default=columnar.DEFAULT_BLOCK_BYTES // (1024 * 1024),
+        help="CSV bytes parsed per Parquet row group; bounds memory use (default: %(default)s)",
+    )
+
+    load = commands.add_parser("import", help="append an exported directory with COPY")
+    load.add_argument("directory", type=Path)
+    load.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.export_batch_size,
+        help="rows read from Parquet per COPY write; bounds memory use (default: %(default)s)",
+    )
+
+    commands.add_parser("rebuild-stats", help="recompute every product's price summary from history")
+
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    if args.command == "rebuild-stats":
+        rebuilt = asyncio.run(_rebuild_price_summaries())
+        print(f"Rebuilt price summaries of {rebuilt} products in {time.perf_counter() - started:.2f}s")
+        return
+    if args.command == "export":
+        results = columnar.export_all(args.directory, block_bytes=args.block_mb * 1024 * 1024)
+    else:
+        if not args.directory.is_dir():
+            parser.error(f"{args.directory} is not a directory")
+        results = columnar.import_all(args.directory, batch_rows=args.batch_size)
+    _report(results, started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Bulk Parquet export and import of products and price history through PostgreSQL COPY.
+
+Rows never pass through Python objects: ``COPY ... TO STDOUT`` is parsed block by block
+by Arrow's CSV reader and written as Parquet row groups, and Parquet record batches
+are written back as CSV into ``COPY ... FROM STDIN``. Memory is bounded by the block
+size either way. Price history is written as one file per table partition.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import psycopg
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from psycopg import sql
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, String, Table, Text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.partitions import DEFAULT_PARTITION, PARENT_TABLE, add_months, partition_name
+from app.models import PriceHistory, Product
+
+DEFAULT_BLOCK_BYTES = 32 * 1024 * 1024
+PRODUCTS_FILE = "products.parquet"
+HISTORY_DIR = "price_history"
+
+
+@dataclass
+class TransferStats:
+    """Rows and bytes moved for one file, with the wall time it took."""
+
+    name: str
+    rows: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.rows / self.seconds if self.seconds else 0.0
+        megabytes = self.bytes / 1_000_000
+        return f"{self.name}: {self.rows} rows, {megabytes:.1f} MB in {self.seconds:.2f}s ({rate:,.0f} rows/s)"
+
+
+def connect() -> psycopg.Connection:
+    """Open a plain psycopg connection to the configured database."""
+
+    url = make_url(settings.sqlalchemy_sync_database_url).set(drivername="postgresql")
+    return psycopg.connect(url.render_as_string(hide_password=False))
+
+
+def arrow_schema(table: Table) -> pa.Schema:
+    """Map a table's columns to Arrow types matching what PostgreSQL stores."""
+
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int32()
+        elif isinstance(column.type, Numeric):
+            arrow_type = pa.decimal128(column.type.precision, column.type.scale)
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, (String, Text)):
+            arrow_type = pa.string()
+        else:
+            raise TypeError(f"No Arrow type for {table.name}.{column.name} ({column.type})")
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+class _CopyReader:
+    """File-like view of ``COPY ... TO STDOUT`` output for Arrow's streaming CSV reader."""
+
+    def __init__(self, chunks: Iterator[memoryview]) -> None:
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self.bytes = 0
+        self.closed = False
+
+    def _fill(self, size: int) -> None:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+            self.bytes += len(chunk)
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def empty(self) -> bool:
+        if not self._buffer:
+            self._fill(1)
+        return not self._buffer
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def export_table(
+    connection: psycopg.Connection,
+    source: str,
+    schema: pa.Schema,
+    path: Path,
+    *,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> TransferStats:
+    """Copy every row of ``source`` into a Parquet file at ``path``, one row group per block."""
+
+    stats = TransferStats(path.name)
+    started = time.perf_counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    statement = sql.SQL("COPY (SELECT {columns} FROM {source}) TO STDOUT (FORMAT csv)").format(
+        columns=sql.SQL(", ").join(sql.Identifier(name) for name in schema.names),
+        source=sql.Identifier(source),
+    )
+    with connection.cursor() as cursor, cursor.copy(statement) as copy:
+        reader = _CopyReader(iter(copy))
+        with pq.ParquetWriter(path, schema) as writer:
+            # Arrow refuses to open an empty CSV stream; an empty source still gets its file.
+            if reader.empty():
+                batches = []
+            else:
+                batches = pa_csv.open_csv(
+                    reader,
+                    read_options=pa_csv.ReadOptions(column_names=schema.names, block_size=block_bytes),
+                    # Quoted values keep their newlines; without this, blocks split mid-record.
+                    parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=schema,
+                        true_values=["t"],
+                        false_values=["f"],
+                        strings_can_be_null=True,
+                        quoted_strings_can_be_null=False,
+                    ),
+                )
+            for batch in batches:
+                # The CSV reader drops NOT NULL flags; reattach the declared schema.
+                writer.write_batch(pa.RecordBatch.from_arrays(batch.columns, schema=schema))
+                stats.rows += batch.num_rows
+    stats.bytes = reader.bytes
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def import_file(
+    connection: psycopg.Connection,
+    path: Path,
+    target: str,
+    *,
+    batch_rows: int,
+) -> TransferStats:
+    """Append the rows of a Parquet file to ``target`` with ``COPY FROM STDIN``."""
+
+    stats = TransferStats(path.name)
+    started = time.perf_counter()
+    parquet = pq.ParquetFile(path)
+    statement = sql.SQL("COPY {target} ({columns}) FROM STDIN (FORMAT csv)").format(
+        target=sql.Identifier(target),
+        columns=sql.SQL(", ").join(sql.Identifier(name) for name in parquet.schema_arrow.names),
+    )
+    options = pa_csv.WriteOptions(include_header=False)
+    with connection.cursor() as cursor, cursor.copy(statement) as copy:
+        for batch in parquet.iter_batches(batch_size=batch_rows):
+            sink = pa.BufferOutputStream()
+            pa_csv.write_csv(batch, sink, write_options=options)
+            data = sink.getvalue()
+            copy.write(memoryview(data))
+            stats.rows += batch.num_rows
+            stats.bytes += data.size
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _history_sources(connection: psycopg.Connection) -> list[str]:
+    rows = connection.execute(
+        "SELECT child.relname FROM pg_inherits"
+        " JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid"
+        " WHERE pg_inherits.inhparent = CAST(%s AS regclass) ORDER BY child.relname",
+        [PARENT_TABLE],
+    ).fetchall()
+    return [name for (name,) in rows]
+
+
+def export_all(directory: Path, *, block_bytes: int = DEFAULT_BLOCK_BYTES) -> list[TransferStats]:
+    """Export products and every price history partition under ``directory``.
+
+    The export runs in one repeatable-read transaction, so all files describe the same snapshot.
+    """
+
+    schema = arrow_schema(Product.__table__)
+    history_schema = arrow_schema(PriceHistory.__table__)
+    results = []
+    with connect() as connection:
+        connection.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+        with connection.transaction():
+            results.append(
+                export_table(connection, Product.__tablename__, schema, directory / PRODUCTS_FILE, block_bytes=block_bytes)
+            )
+            for source in _history_sources(connection):
+                path = directory / HISTORY_DIR / f"{source}.parquet"
+                results.append(export_table(connection, source, history_schema, path, block_bytes=block_bytes))
+    return results
+
+
+def _ensure_history_partitions(connection: psycopg.Connection, months: list[datetime]) -> None:
+    """Create missing monthly partitions so imported rows skip the default partition."""
+
+    existing = set(_history_sources(connection))
+    for month in months:
+        if partition_name(month) in existing:
+            continue
+        connection.execute(
+            sql.SQL("CREATE TABLE {name} PARTITION OF {parent} FOR VALUES FROM ({start}) TO ({end})").format(
+                name=sql.Identifier(partition_name(month)),
+                parent=sql.Identifier(PARENT_TABLE),
+                start=sql.Literal(month),
+                end=sql.Literal(add_months(month, 1)),
+            )
+        )
+
+
+def _partition_month(path: Path) -> datetime | None:
+    suffix = path.stem.removeprefix(f"{PARENT_TABLE}_")
+    if path.stem == DEFAULT_PARTITION or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return datetime(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def import_all(directory: Path, *, batch_rows: int) -> list[TransferStats]:
+    """Load an :func:`export_all` directory in one transaction and advance the id sequences.
+
+    Rows are appended, so importing into a database that already holds the same ids fails
+    and leaves it untouched.
+    """
+
+    history_paths = sorted((directory / HISTORY_DIR).glob("*.parquet"))
+    results = []
+    with connect() as connection:
+        with connection.transaction():
+            products = directory / PRODUCTS_FILE
+            if products.exists():
+                results.append(import_file(connection, products, Product.__tablename__, batch_rows=batch_rows))
+            months = [month for month in map(_partition_month, history_paths) if month is not None]
+            _ensure_history_partitions(connection, months)
+            for path in history_paths:
+                results.append(import_file(connection, path, PARENT_TABLE, batch_rows=batch_rows))
+            for table in (Product.__tablename__, PARENT_TABLE):
+                connection.execute(
+                    sql.SQL(
+                        "SELECT setval(pg_get_serial_sequence({table}, 'id'), coalesce(max(id), 0) + 1, false) FROM {ident}"
+                    ).format(table=sql.Literal(table), ident=sql.Identifier(table))
+                )
+    return results
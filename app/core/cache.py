@@ -0,0 +1,206 @@
+"""Redis read-through cache for serialised API responses.
+
+Entries are grouped into namespaces (the product list, and each product's history).
+Every namespace has a generation counter in Redis; writers bump it after committing,
+which orphans all of the namespace's entries at once. Entries carry the generation
+they were built under and are only served while it is current, so a response built
+from data read before a concurrent commit is never served after it.
+
+With read replicas, a response built right after a write may come from a replica that
+has not replayed it yet. Writers therefore also mark the namespace as recently written
+for ``database_read_your_writes_seconds``, during which nothing is cached under it, and
+clients pinned to the primary by that write skip the cache altogether.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from typing import NamedTuple
+
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import reads_from_primary
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "pricepulse:cache"
+PRODUCTS_NAMESPACE = "products"
+# ``session.info`` key collecting namespaces to invalidate once the session commits.
+_STALE_INFO_KEY = "stale_cache_namespaces"
+
+
+def history_namespace(product_id: int) -> str:
+    return f"history:{product_id}"
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class CacheStats:
+    """Per-process hit/miss counters keyed by namespace kind (``products`` or ``history``)."""
+
+    def __init__(self) -> None:
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        kinds = self.hits.keys() | self.misses.keys() | self.errors.keys()
+        return {
+            kind: {"hits": self.hits[kind], "misses": self.misses[kind], "errors": self.errors[kind]}
+            for kind in sorted(kinds)
+        }
+
+
+stats = CacheStats()
+
+
+def _kind(namespace: str) -> str:
+    return namespace.split(":", 1)[0]
+
+
+def _keys(namespace: str, params: str) -> tuple[str, str]:
+    """Return ``(generation_key, entry_key)``; the hash tag keeps both in one cluster slot."""
+
+    digest = hashlib.sha1(params.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{{{namespace}}}:gen", f"{KEY_PREFIX}:{{{namespace}}}:{digest}"
+
+
+def _written_key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:{{{namespace}}}:written"
+
+
+def _replica_lag_window() -> int:
+    """Return how long after a write replica reads may miss it, or 0 without replicas."""
+
+    return settings.database_read_your_writes_seconds if settings.sqlalchemy_async_read_urls else 0
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+async def lookup(namespace: str, params: str) -> tuple[bytes, CachedBody | None]:
+    """Return the namespace's current generation and the entry for ``params`` if it is fresh.
+
+    The generation must be passed back to :func:`store` so an entry built from data
+    read before an invalidation is discarded. It is empty, so nothing gets stored, while
+    the namespace was written too recently for replicas to be trusted. Redis errors count
+    as a miss.
+    """
+
+    generation_key, entry_key = _keys(namespace, params)
+    try:
+        generation, entry, written = await get_redis().mget(generation_key, entry_key, _written_key(namespace))
+    except RedisError as exc:
+        stats.errors[_kind(namespace)] += 1
+        logger.warning("Response cache unavailable: %s", exc)
+        return b"", None
+
+    generation = generation or b"0"
+    if entry is not None:
+        header, _, body = entry.partition(b"\n")
+        entry_generation, _, etag = header.partition(b" ")
+        if entry_generation == generation:
+            stats.hits[_kind(namespace)] += 1
+            return generation, CachedBody(body, etag.decode())
+    stats.misses[_kind(namespace)] += 1
+    return (b"" if written else generation), None
+
+
+async def store(namespace: str, params: str, generation: bytes, cached: CachedBody) -> None:
+    """Cache ``cached`` for ``settings.cache_ttl_seconds`` under the generation seen by :func:`lookup`."""
+
+    if not generation:
+        return
+    _, entry_key = _keys(namespace, params)
+    value = generation + b" " + cached.etag.encode() + b"\n" + cached.body
+    try:
+        await get_redis().set(entry_key, value, ex=settings.cache_ttl_seconds)
+    except RedisError as exc:
+        stats.errors[_kind(namespace)] += 1
+        logger.warning("Response cache unavailable: %s", exc)
+
+
+async def invalidate(namespaces: Iterable[str]) -> None:
+    """Bump the generation of each namespace, orphaning every entry cached under it."""
+
+    namespaces = set(namespaces)
+    if not namespaces or not settings.cache_enabled:
+        return
+    lag_window = _replica_lag_window()
+    try:
+        async with get_redis().pipeline(transaction=False) as pipeline:
+            for namespace in namespaces:
+                pipeline.incr(_keys(namespace, "")[0])
+                if lag_window:
+                    pipeline.set(_written_key(namespace), b"1", ex=lag_window)
+            await pipeline.execute()
+    except RedisError as exc:
+        logger.warning("Failed to invalidate cached responses, stale entries expire after their TTL: %s", exc)
+
+
+def mark_stale(session: AsyncSession, *, products: bool = False, product_ids: Iterable[int] = ()) -> None:
+    """Record namespaces changed by ``session`` so :func:`invalidate_stale` can bump them after commit."""
+
+    stale = session.info.setdefault(_STALE_INFO_KEY, set())
+    if products:
+        stale.add(PRODUCTS_NAMESPACE)
+    stale.update(history_namespace(product_id) for product_id in product_ids)
+
+
+async def invalidate_stale(session: AsyncSession) -> None:
+    """Invalidate the namespaces marked on ``session``; call right after it commits."""
+
+    await invalidate(session.info.pop(_STALE_INFO_KEY, ()))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _respond(request: Request, cached: CachedBody) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+async def cached_response(
+    request: Request,
+    namespace: str,
+    build: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Serve a JSON response from the cache, building and caching its body with ``build`` on a miss.
+
+    Responses carry an ETag and honour ``If-None-Match`` whether or not caching is
+    enabled. Exceptions raised by ``build`` (e.g. a 404) propagate and nothing is cached.
+    Clients pinned to the primary after a write bypass the cache so they see the write.
+    """
+
+    params = f"{request.url.path}?{'&'.join(sorted(str(request.query_params).split('&')))}"
+    generation = b""
+    use_cache = settings.cache_enabled and not reads_from_primary(request)
+    if use_cache:
+        generation, cached = await lookup(namespace, params)
+        if cached is not None:
+            return _respond(request, cached)
+
+    body = await build()
+    cached = CachedBody(body, compute_etag(body))
+    if use_cache:
+        await store(namespace, params, generation, cached)
+    return _respond(request, cached)
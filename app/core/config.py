@@ -49,13 +49,115 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=5, ge=1, description="Base connection pool size.")
     database_max_overflow: int = Field(default=10, ge=0, description="Maximum overflow connections.")
     database_pool_timeout: int = Field(default=30, ge=1, description="Seconds to wait for a connection.")
+    # ``str`` lets comma-separated env values skip JSON decoding; the validator splits them.
+    database_read_urls: list[str] | str = Field(
+        default_factory=list,
+        description="Comma-separated read replica URLs serving read-only endpoints.",
+    )
+    database_read_max_lag_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Replicas further behind the primary than this are skipped.",
+    )
+    database_read_retry_seconds: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds a failed or lagging replica is skipped before being tried again.",
+    )
+    database_read_your_writes_seconds: int = Field(
+        default=5,
+        ge=0,
+        description="Seconds a client reads from the primary after writing; 0 disables.",
+    )
 
     redis_url: str = Field(default="redis://localhost:6379/0", description="Redis connection URI.")
+    fast_json_responses: bool = Field(
+        default=True,
+        description="Encode list and history responses straight from column values with orjson.",
+    )
+    export_batch_size: int = Field(default=5000, ge=100, description="Rows fetched per batch by history exports.")
+    cache_enabled: bool = Field(default=True, description="Cache product and history responses in Redis.")
+    cache_ttl_seconds: int = Field(default=300, ge=1, description="Lifetime of cached API responses.")
+    product_cache_enabled: bool = Field(default=True, description="Cache product metadata in each process.")
+    product_cache_size: int = Field(default=10_000, ge=1, description="Products kept in the metadata cache.")
+    product_cache_ttl_seconds: int = Field(default=300, ge=1, description="Lifetime of cached product metadata.")
 
     celery_broker_url: str | None = None
     celery_result_backend: str | None = None
 
     scrape_interval_minutes: int = Field(default=60, ge=1, description="Task interval in minutes.")
+    scrape_batch_size: int = Field(default=200, ge=1, description="Products tracked per batch task.")
+    scrape_min_interval_minutes: int = Field(default=10, ge=1, description="Shortest adaptive interval.")
+    scrape_max_interval_minutes: int = Field(default=1440, ge=1, description="Longest adaptive interval.")
+    scrape_concurrency: int = Field(default=50, ge=1, description="Concurrent scrapes per worker process.")
+    scrape_per_host_limit: int = Field(default=4, ge=1, description="Concurrent scrapes per target host.")
+    scrape_timeout_seconds: float = Field(default=15.0, gt=0, description="Timeout for a single scrape.")
+    scrape_user_agent: str = Field(default="PricePulse/0.1", description="User-Agent sent by scrapers.")
+    scrape_rate_limit_per_second: float = Field(default=1.0, gt=0, description="Requests per second per platform.")
+    scrape_rate_limit_burst: int = Field(default=5, ge=1, description="Token bucket capacity per platform.")
+    scrape_platform_rate_limits: dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-platform requests per second overriding the default, as JSON.",
+    )
+    scrape_rate_limit_shared: bool = Field(default=True, description="Share token buckets across workers via Redis.")
+    scrape_breaker_failure_threshold: int = Field(default=5, ge=1, description="Failures that open a circuit.")
+    scrape_breaker_cooldown_seconds: int = Field(default=300, ge=1, description="Seconds a circuit stays open.")
+    price_history_change_only: bool = Field(
+        default=True,
+        description="Extend the latest history run instead of writing a row when a price is unchanged.",
+    )
+    price_history_partitions_ahead: int = Field(
+        default=3,
+        ge=1,
+        description="Future monthly price history partitions created ahead of time.",
+    )
+    price_history_retention_days: int | None = Field(
+        default=None,
+        ge=1,
+        description="Roll up and drop price history partitions older than this; unset keeps all history.",
+    )
+    price_history_maintenance_seconds: int = Field(
+        default=3600,
+        ge=60,
+        description="How often history partitions are created and retention is applied.",
+    )
+    scheduler_tick_seconds: int = Field(default=60, ge=1, description="How often due products are dispatched.")
+    metrics_enabled: bool = Field(default=True, description="Record Prometheus metrics and serve them at /metrics.")
+    metrics_worker_port: int | None = Field(
+        default=None,
+        ge=1,
+        le=65535,
+        description=(
+            "Port Celery workers serve metrics on, e.g. 9808; pool processes use the following ports"
+            " unless multiprocess. Unset serves none."
+        ),
+    )
+    profiling_enabled: bool = Field(
+        default=False,
+        description="Profile requests sent with an X-Profile header, returning the profile instead.",
+    )
+    profiling_token: str | None = Field(
+        default=None,
+        description="Value the X-Profile header must carry to be honoured; unset ignores the header.",
+    )
+    profiling_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of all requests profiled while profiling is enabled.",
+    )
+    profiling_interval_seconds: float = Field(default=0.001, gt=0, description="Profiler sampling interval.")
+    profiling_dir: Path | None = Field(default=None, description="Directory receiving HTML profiles.")
+    slow_query_ms: int | None = Field(
+        default=None,
+        ge=1,
+        description="Log statements slower than this with their parameters and plan; unset disables.",
+    )
+    slow_query_explain: bool = Field(default=True, description="Include EXPLAIN plans in slow query logs.")
+    alert_webhook_url: str | None = Field(
+        default=None,
+        description="URL receiving target price alerts as JSON; alerts are only logged when unset.",
+    )
 
     @field_validator("cors_allow_origins", mode="before")
     @classmethod
@@ -66,6 +168,15 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in value.split(",") if origin.strip()]
         return value
 
+    @field_validator("database_read_urls", mode="before")
+    @classmethod
+    def _split_read_urls(cls, value: str | list[str]) -> list[str]:
+        """Allow comma-delimited replica URLs in env vars."""
+
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
+
     @field_validator("celery_broker_url", "celery_result_backend", mode="before")
     @classmethod
     def _default_celery_urls(cls, value: str | None, info: FieldValidationInfo) -> str | None:
@@ -76,17 +187,26 @@ class Settings(BaseSettings):
         redis_url = info.data.get("redis_url")
         return redis_url
 
-    @property
-    def sqlalchemy_async_database_url(self) -> str:
-        """Return the SQLAlchemy async database URL, normalising sync URLs when needed."""
-
-        url = str(self.database_url)
+    @staticmethod
+    def _async_url(url: str) -> str:
         if url.startswith("postgresql+asyncpg://"):
             return url
         if url.startswith("postgresql://"):
             return url.replace("postgresql://", "postgresql+asyncpg://", 1)
         return url
 
+    @property
+    def sqlalchemy_async_database_url(self) -> str:
+        """Return the SQLAlchemy async database URL, normalising sync URLs when needed."""
+
+        return self._async_url(str(self.database_url))
+
+    @property
+    def sqlalchemy_async_read_urls(self) -> list[str]:
+        """Return the read replica URLs normalised like :attr:`sqlalchemy_async_database_url`."""
+
+        return [self._async_url(url) for url in self.database_read_urls]
+
     @property
     def sqlalchemy_sync_database_url(self) -> str:
         """Return sync SQLAlchemy URL using psycopg driver for migrations."""
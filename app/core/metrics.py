@@ -0,0 +1,253 @@
+"""Prometheus metrics for API requests, database queries and pool, Celery tasks and scrapes.
+
+Metrics live in the default ``prometheus_client`` registry of each process. When several
+processes serve one host (Uvicorn or Celery workers), point ``PROMETHEUS_MULTIPROC_DIR``
+at a shared, empty directory before they start and ``/metrics`` reports all of them.
+Celery workers also serve their metrics themselves; see :mod:`app.tasks.instrumentation`.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Sub-millisecond buckets for queries and pool waits, which are far faster than requests.
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"})
+
+REQUEST_DURATION = Histogram(
+    "pricepulse_http_request_duration_seconds",
+    "Time to serve an HTTP request, including streaming the body.",
+    ["method", "route", "status"],
+)
+QUERY_DURATION = Histogram(
+    "pricepulse_db_query_duration_seconds",
+    "Time spent executing SQL statements, by leading keyword.",
+    ["operation"],
+    buckets=_FAST_BUCKETS,
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "pricepulse_db_pool_checkout_wait_seconds",
+    "Time to obtain a pooled database connection, including opening new ones.",
+    buckets=_FAST_BUCKETS,
+)
+POOL_TIMEOUTS = Counter(
+    "pricepulse_db_pool_timeouts_total",
+    "Checkouts that gave up after database_pool_timeout seconds.",
+)
+TASK_DURATION = Histogram(
+    "pricepulse_celery_task_duration_seconds",
+    "Celery task runtime, by task and final state.",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+TASK_QUEUE_LAG = Histogram(
+    "pricepulse_celery_task_queue_lag_seconds",
+    "Time between a task being published and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+SCRAPES = Counter(
+    "pricepulse_scrapes_total",
+    "Scrape attempts by platform and outcome: ok, unchanged, failed or circuit_open.",
+    ["platform", "outcome"],
+)
+SCRAPE_DURATION = Histogram(
+    "pricepulse_scrape_duration_seconds",
+    "Time to fetch and parse one product page once it holds an executor slot.",
+    ["platform"],
+)
+
+
+def _operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in _QUERY_OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    QUERY_DURATION.labels(_operation(statement)).observe(time.perf_counter() - context._metrics_started)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited."""
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+class _PoolCollector(Collector):
+    """Reports the live state of the instrumented engines' pools at scrape time."""
+
+    def __init__(self) -> None:
+        self.engines: dict[str, Engine] = {}
+
+    def describe(self) -> list[GaugeMetricFamily]:
+        return []
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        connections = GaugeMetricFamily(
+            "pricepulse_db_pool_connections",
+            "Pooled connections by state.",
+            labels=["engine", "state"],
+        )
+        capacity = GaugeMetricFamily(
+            "pricepulse_db_pool_capacity",
+            "Most connections the pool opens: database_pool_size plus database_max_overflow.",
+            labels=["engine"],
+        )
+        saturation = GaugeMetricFamily(
+            "pricepulse_db_pool_saturation",
+            "Checked-out connections as a fraction of the pool's capacity.",
+            labels=["engine"],
+        )
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            limit = pool.size() + max(pool._max_overflow, 0)
+            connections.add_metric([name, "checked_out"], pool.checkedout())
+            connections.add_metric([name, "idle"], pool.checkedin())
+            capacity.add_metric([name], limit)
+            saturation.add_metric([name], pool.checkedout() / limit if limit else 0.0)
+        yield connections
+        yield capacity
+        yield saturation
+
+
+class _CacheCollector(Collector):
+    """Exposes the response cache and product metadata cache counters."""
+
+    def describe(self) -> list[CounterMetricFamily]:
+        # Registering must not import crud, which would import this module's callers.
+        return []
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        from app import crud
+        from app.core import cache
+
+        responses = CounterMetricFamily(
+            "pricepulse_response_cache_lookups",
+            "Redis response cache lookups by namespace kind and result.",
+            labels=["kind", "result"],
+        )
+        for kind, counts in cache.stats.snapshot().items():
+            for result, value in counts.items():
+                responses.add_metric([kind, result], value)
+        yield responses
+
+        info = crud.product_metadata_cache_info()
+        metadata = CounterMetricFamily(
+            "pricepulse_product_cache_events",
+            "In-process product metadata cache events.",
+            labels=["event"],
+        )
+        for name in ("hits", "misses", "evictions", "expirations"):
+            metadata.add_metric([name], getattr(info, name))
+        yield metadata
+        yield GaugeMetricFamily("pricepulse_product_cache_size", "Products held in the metadata cache.", value=info.size)
+
+
+_pools = _PoolCollector()
+REGISTRY.register(_pools)
+REGISTRY.register(_CacheCollector())
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """Time every statement run on ``engine`` and report its pool under ``name``."""
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _pools.engines[name] = sync_engine
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    # Raw paths of unmatched requests would give every scanner probe its own series.
+    return getattr(route, "path", "<unmatched>")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by method, route template and status."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_DURATION.labels(scope["method"], _route_label(scope), str(status)).observe(
+                time.perf_counter() - started
+            )
+
+
+def multiprocess_mode() -> bool:
+    """Whether metrics are shared between processes through ``PROMETHEUS_MULTIPROC_DIR``."""
+
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Return the registry to serve: this process's, or every process's in multiprocess mode."""
+
+    if not multiprocess_mode():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_pools)
+    registry.register(_CacheCollector())
+    return registry
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve every metric in the Prometheus text format."""
+
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,26 @@
+"""Opaque cursor helpers for keyset pagination."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a ``(timestamp, id)`` keyset position as an opaque URL-safe token."""
+
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by :func:`encode_cursor`, raising ``ValueError`` when malformed."""
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
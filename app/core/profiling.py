@@ -0,0 +1,141 @@
+"""Opt-in request profiling and slow query logging for diagnosing slow endpoints.
+
+GET and HEAD requests carrying ``X-Profile: <profiling_token>`` (and a
+``profiling_sample_rate`` share of all requests) run under pyinstrument's sampling
+profiler while ``profiling_enabled`` is set. Profiles are written to ``profiling_dir``
+when configured, otherwise sampled ones are logged; header-requested ones are also
+returned in place of the response, which is discarded after the handler ran. A missing
+or wrong token leaves the request unprofiled, since profiles expose the code's internals. Separately,
+statements slower than ``slow_query_ms`` are logged with their parameters and
+``EXPLAIN`` plan.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import secrets
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pyinstrument import Profiler
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+# The handler still runs when the profile replaces its response, so only reads are profiled on request.
+_PROFILED_METHODS = ("GET", "HEAD")
+# EXPLAIN without ANALYZE plans these without running them again.
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_LOGGED_CHARS = 2000
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= _LOGGED_CHARS else f"{text[:_LOGGED_CHARS]}... ({len(text)} chars)"
+
+
+def _explain(connection: Any, statement: str, parameters: Any) -> str:
+    # A separate DBAPI cursor leaves the slow statement's pending rows untouched.
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed_ms = (time.perf_counter() - context._slow_query_started) * 1000
+    if settings.slow_query_ms is None or elapsed_ms < settings.slow_query_ms:
+        return
+    plan = "(not explained)"
+    if settings.slow_query_explain and not executemany and statement.lstrip()[:6].upper() in _EXPLAINABLE:
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as exc:
+            plan = f"(EXPLAIN failed: {exc})"
+    logger.warning(
+        "Slow query took %.1f ms:\n%s\nParameters: %s\n%s",
+        elapsed_ms,
+        _clip(statement),
+        _clip(repr(parameters)),
+        plan,
+    )
+
+
+def log_slow_queries(engine: AsyncEngine) -> None:
+    """Log statements on ``engine`` that run longer than ``settings.slow_query_ms``."""
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _profile_requested(scope: Scope) -> bool:
+    """Return whether the request carries ``X-Profile`` with the configured token on a safe method."""
+
+    token = settings.profiling_token
+    if not token or scope["method"] not in _PROFILED_METHODS:
+        return False
+    return any(
+        name == PROFILE_HEADER and secrets.compare_digest(value, token.encode()) for name, value in scope["headers"]
+    )
+
+
+def _profile_path(directory: Path, scope: Scope, elapsed_ms: float) -> Path:
+    route = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    return directory / f"{stamp}-{scope['method']}-{route}-{elapsed_ms:.0f}ms.html"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requested or sampled requests with pyinstrument."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = _profile_requested(scope)
+        if not requested and random.random() >= settings.profiling_sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            pass
+
+        # async_mode="enabled" samples only this request's task, not concurrent ones.
+        profiler = Profiler(interval=settings.profiling_interval_seconds, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard if requested else send)
+        finally:
+            profiler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if settings.profiling_dir is not None:
+            path = _profile_path(settings.profiling_dir, scope, elapsed_ms)
+            await run_in_threadpool(path.parent.mkdir, parents=True, exist_ok=True)
+            await run_in_threadpool(path.write_text, profiler.output_html())
+            logger.info("Profiled %s %s in %.1f ms: %s", scope["method"], scope["path"], elapsed_ms, path)
+        elif not requested:
+            logger.info("Profiled %s %s in %.1f ms:\n%s", scope["method"], scope["path"], elapsed_ms, profiler.output_text())
+        if requested:
+            await HTMLResponse(profiler.output_html())(scope, receive, send)
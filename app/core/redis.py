@@ -0,0 +1,27 @@
+"""Lazily created Redis client shared within a process."""
+
+from __future__ import annotations
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_client: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Return the process-wide async Redis client bound to ``settings.redis_url``."""
+
+    global _client
+    if _client is None:
+        _client = Redis.from_url(settings.redis_url)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared client and its connection pool."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,36 @@
+"""JSON encoding of API responses."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+def _encode_extra(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain ``content`` with orjson, writing ``Decimal`` values as strings."""
+
+    return orjson.dumps(content, default=_encode_extra)
+
+
+def dump_json(content: Any, adapter: TypeAdapter[Any]) -> bytes:
+    """Serialise plain ``content`` (dicts, lists, column values) in the shape of ``adapter``'s type.
+
+    With ``settings.fast_json_responses`` the values are encoded directly by orjson, which
+    matches Pydantic's JSON output for the column types we serve (``Decimal`` as a string,
+    naive ISO 8601 datetimes). Otherwise every item is validated through ``adapter`` first.
+    """
+
+    if settings.fast_json_responses:
+        return dumps(content)
+    return adapter.dump_json(adapter.validate_python(content))
@@ -2,15 +2,99 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Sequence
+from typing import Any, Iterable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    DateTime,
+    Integer,
+    Numeric,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    table,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
-from app.models import PriceHistory, Product
-from app.schemas import ProductCreate
+from app import alerts
+from app.core import cache
+from app.core.config import settings
+from app.core.lru import CacheInfo, LRUCache
+from app.models import PriceHistory, PriceHistoryDaily, Product
+from app.schemas import PriceAlert, PriceHistoryRead, ProductCreate, ProductMetadata, ProductRead
+
+
+HISTORY_BUCKET_UNITS = {"1h": "hour", "1d": "day", "1w": "week"}
+
+# Windows behind ``PriceStats``: low/high prices, then percentiles and volatility.
+STATS_RANGE_WINDOW = timedelta(days=90)
+STATS_RECENT_WINDOW = timedelta(days=30)
+
+# Rows per ``UPDATE ... FROM (VALUES ...)`` statement, well under the 32767 bind-parameter limit.
+BULK_UPDATE_CHUNK_SIZE = 5000
+# The price summary update binds eight values per product, so it takes fewer rows per statement.
+PRICE_SUMMARY_CHUNK_SIZE = 2000
+
+PriceObservation = tuple[int, Decimal | float | int | str, datetime | None]
+
+# ``(etag, last_modified, content_hash)`` as last seen by a scraper.
+PageValidatorValues = tuple[str | None, str | None, str | None]
+
+METADATA_FIELDS = tuple(ProductMetadata.model_fields)
+
+# Columns behind the read schemas, in field order, for queries that skip ORM entities.
+PRODUCT_READ_COLUMNS = tuple(getattr(Product, name) for name in ProductRead.model_fields if name != "price_history")
+HISTORY_READ_COLUMNS = tuple(getattr(PriceHistory, name) for name in PriceHistoryRead.model_fields)
+HISTORY_EXPORT_COLUMNS = (
+    PriceHistory.product_id,
+    PriceHistory.id,
+    PriceHistory.price,
+    PriceHistory.checked_at,
+    PriceHistory.last_seen_at,
+    PriceHistory.check_count,
+)
+
+# Columns a scrape reads and updates on every check, so never cached like the metadata.
+SCRAPE_STATE_COLUMNS = (
+    Product.id,
+    Product.last_price,
+    Product.target_price,
+    Product.page_etag,
+    Product.page_last_modified,
+    Product.price_content_hash,
+)
+
+# Per-process; other processes see edits once their entries expire.
+_product_metadata: LRUCache[int, ProductMetadata] = LRUCache(
+    settings.product_cache_size,
+    settings.product_cache_ttl_seconds,
+    enabled=settings.product_cache_enabled,
+)
 
 
 def _to_decimal(value: Decimal | float | int | str) -> Decimal:
@@ -27,7 +111,11 @@ async def create_product(
     *,
     commit: bool = True,
 ) -> Product:
-    """Persist a new product and return the ORM instance."""
+    """Persist a new product and return the ORM instance.
+
+    Cached product lists are invalidated on commit; with ``commit=False`` call
+    :func:`app.core.cache.invalidate_stale` after committing.
+    """
 
     product = Product(
         name=data.name,
@@ -37,9 +125,11 @@ async def create_product(
         currency=data.currency,
     )
     session.add(product)
+    cache.mark_stale(session, products=True)
 
     if commit:
         await session.commit()
+        await cache.invalidate_stale(session)
         await session.refresh(product)
     else:
         await session.flush()
@@ -47,24 +137,511 @@ async def create_product(
     return product
 
 
-async def get_products(session: AsyncSession) -> Sequence[Product]:
-    """Return all tracked products ordered by creation date."""
+async def get_products(
+    session: AsyncSession,
+    *,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+) -> Sequence[RowMapping]:
+    """Return tracked products newest first, optionally as a keyset page.
+
+    ``after`` is the ``(created_at, id)`` of the last product on the previous page.
+    Rows are plain mappings of the ``ProductRead`` columns, ready to serialise without
+    building ORM entities. Price history is not included; see :func:`get_recent_price_history`.
+    """
 
-    statement = select(Product).options(selectinload(Product.price_history)).order_by(Product.created_at.desc())
+    statement = select(*PRODUCT_READ_COLUMNS).order_by(Product.created_at.desc(), Product.id.desc())
+    if after is not None:
+        statement = statement.where(tuple_(Product.created_at, Product.id) < tuple_(*after))
+    if limit is not None:
+        statement = statement.limit(limit)
     result = await session.execute(statement)
-    return result.scalars().unique().all()
+    return result.mappings().all()
+
+
+async def get_scrape_states(session: AsyncSession, product_ids: Sequence[int]) -> Sequence[Row]:
+    """Return the state a scrape reads and updates, ``SCRAPE_STATE_COLUMNS``, in one query.
+
+    Unknown ids are skipped. Pair with :func:`get_product_metadata` for what to scrape.
+    """
+
+    if not product_ids:
+        return []
+    result = await session.execute(select(*SCRAPE_STATE_COLUMNS).where(Product.id.in_(product_ids)))
+    return result.all()
+
+
+async def get_product_metadata(session: AsyncSession, product_ids: Sequence[int]) -> dict[int, ProductMetadata]:
+    """Return metadata for ``product_ids`` from the cache, loading any misses in one query.
+
+    Unknown ids are left out of the result.
+    """
+
+    found: dict[int, ProductMetadata] = {}
+    missing = []
+    for product_id in product_ids:
+        metadata = _product_metadata.get(product_id)
+        if metadata is None:
+            missing.append(product_id)
+        else:
+            found[product_id] = metadata
+
+    if missing:
+        statement = select(*(getattr(Product, name) for name in METADATA_FIELDS)).where(Product.id.in_(missing))
+        for row in await session.execute(statement):
+            metadata = ProductMetadata.model_validate(row)
+            _product_metadata.put(metadata.id, metadata)
+            found[metadata.id] = metadata
+    return found
+
+
+def invalidate_product_metadata(product_ids: Iterable[int]) -> None:
+    """Drop cached metadata for ``product_ids``; call after editing them outside the ORM."""
+
+    _product_metadata.invalidate(product_ids)
+
+
+def product_metadata_cache_info() -> CacheInfo:
+    return _product_metadata.info()
 
 
-async def get_price_history(session: AsyncSession, product_id: int) -> Sequence[PriceHistory]:
-    """Return stored price snapshots for the given product."""
+@event.listens_for(Product, "after_update")
+def _invalidate_edited_metadata(mapper: Any, connection: Any, target: Product) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in METADATA_FIELDS):
+        invalidate_product_metadata([target.id])
 
+
+async def claim_due_products(
+    session: AsyncSession,
+    *,
+    now: datetime,
+    lease_until: datetime,
+    limit: int,
+) -> Sequence[Row]:
+    """Lease up to ``limit`` active products due at ``now``, most overdue first.
+
+    Claimed products get ``next_check_at = lease_until`` so later ticks skip them while their
+    check is in flight; rows locked by a concurrent claim are skipped. Returns ``(id, platform)``.
+    Call repeatedly, committing each claim before acting on it, to work through every due
+    product without holding locks across batches.
+    """
+
+    due = (
+        select(Product.id)
+        .where(Product.is_active.is_(True), Product.next_check_at <= now)
+        .order_by(Product.next_check_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
     statement = (
-        select(PriceHistory)
-        .where(PriceHistory.product_id == product_id)
-        .order_by(PriceHistory.checked_at.desc())
+        update(Product)
+        .where(Product.id.in_(due.scalar_subquery()))
+        .values(next_check_at=lease_until, updated_at=Product.updated_at)
+        .returning(Product.id, Product.platform)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+    return result.all()
+
+
+async def set_next_check_times(session: AsyncSession, schedule: Mapping[int, datetime]) -> None:
+    """Store each product's next check time with one ``UPDATE ... FROM (VALUES ...)`` per chunk."""
+
+    pending = list(schedule.items())
+    for start in range(0, len(pending), BULK_UPDATE_CHUNK_SIZE):
+        chunk = pending[start : start + BULK_UPDATE_CHUNK_SIZE]
+        planned = values(
+            column("id", Integer),
+            column("next_check_at", DateTime()),
+            name="planned",
+        ).data(chunk)
+        statement = (
+            update(Product)
+            .where(Product.id == planned.c.id)
+            .values(next_check_at=planned.c.next_check_at, updated_at=Product.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(statement)
+
+
+async def record_page_validators(
+    session: AsyncSession,
+    validators: Mapping[int, PageValidatorValues],
+    *,
+    confirmed_at: datetime,
+) -> None:
+    """Store each product's page validators and mark its price as confirmed at ``confirmed_at``."""
+
+    if validators:
+        cache.mark_stale(session, products=True)
+    pending = [(product_id, *values_) for product_id, values_ in validators.items()]
+    for start in range(0, len(pending), BULK_UPDATE_CHUNK_SIZE):
+        chunk = pending[start : start + BULK_UPDATE_CHUNK_SIZE]
+        seen = values(
+            column("id", Integer),
+            column("etag", String(255)),
+            column("last_modified", String(64)),
+            column("content_hash", String(64)),
+            name="seen",
+        ).data(chunk)
+        statement = (
+            update(Product)
+            .where(Product.id == seen.c.id)
+            .values(
+                page_etag=seen.c.etag,
+                page_last_modified=seen.c.last_modified,
+                price_content_hash=seen.c.content_hash,
+                price_confirmed_at=confirmed_at,
+                updated_at=Product.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(statement)
+
+
+async def get_recent_prices(
+    session: AsyncSession,
+    product_ids: Sequence[int],
+    limit: int,
+) -> dict[int, list[Decimal]]:
+    """Return up to ``limit`` most recent checked prices per product, newest first, in one query.
+
+    Runs are expanded to one entry per check, so unchanged checks count towards ``limit``.
+    """
+
+    if not product_ids:
+        return {}
+
+    ranked = (
+        select(
+            PriceHistory.product_id,
+            PriceHistory.price,
+            PriceHistory.check_count,
+            func.row_number()
+            .over(
+                partition_by=PriceHistory.product_id,
+                order_by=(PriceHistory.checked_at.desc(), PriceHistory.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(PriceHistory.product_id.in_(product_ids))
+        .subquery()
+    )
+    statement = (
+        select(ranked.c.product_id, ranked.c.price, ranked.c.check_count)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.product_id, ranked.c.position)
+    )
+    result = await session.execute(statement)
+
+    prices: dict[int, list[Decimal]] = defaultdict(list)
+    for product_id, price, check_count in result:
+        recent = prices[product_id]
+        recent.extend([price] * min(check_count, limit - len(recent)))
+    return prices
+
+
+async def get_recent_price_history(
+    session: AsyncSession,
+    product_ids: Sequence[int],
+    limit: int,
+) -> dict[int, list[RowMapping]]:
+    """Return the latest ``limit`` runs of each product as ``PriceHistoryRead`` column mappings.
+
+    All products are served by a single ``row_number()`` windowed query instead of
+    loading every snapshot ever recorded.
+    """
+
+    if not product_ids:
+        return {}
+
+    ranked = (
+        select(
+            *HISTORY_READ_COLUMNS,
+            func.row_number()
+            .over(
+                partition_by=PriceHistory.product_id,
+                order_by=(PriceHistory.checked_at.desc(), PriceHistory.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(PriceHistory.product_id.in_(product_ids))
+        .subquery()
+    )
+    statement = (
+        select(*(ranked.c[column.key] for column in HISTORY_READ_COLUMNS))
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.product_id, ranked.c.position)
+    )
+    result = await session.execute(statement)
+
+    history: dict[int, list[RowMapping]] = defaultdict(list)
+    for row in result.mappings():
+        history[row["product_id"]].append(row)
+    return history
+
+
+def _since_boundary(product_id: int | ColumnElement[int], since: datetime) -> ColumnElement[datetime]:
+    """Return the start of the run covering ``since`` (or ``since`` itself) as a SQL expression.
+
+    Filtering ``checked_at`` against this keeps history reads as index range scans while
+    still including the run that was current at ``since``.
+    """
+
+    earlier = aliased(PriceHistory)
+    run_start = (
+        select(func.max(earlier.checked_at))
+        .where(earlier.product_id == product_id, earlier.checked_at <= since)
+        .correlate_except(earlier)
+        .scalar_subquery()
+    )
+    return func.coalesce(run_start, since)
+
+
+async def get_price_history(
+    session: AsyncSession,
+    product_id: int,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int | None = None,
+    before: tuple[datetime, int] | None = None,
+) -> list[dict[str, Any]] | None:
+    """Return price runs for the given product newest first, or ``None`` if it does not exist.
+
+    ``since``/``until`` select runs overlapping that window and ``before`` is the
+    ``(checked_at, id)`` keyset of the last row on the previous page. The runs are read
+    through a lateral join on ``products`` so the existence check shares the same round trip,
+    and are returned as ``PriceHistoryRead`` column dicts.
+    """
+
+    history = select(*HISTORY_READ_COLUMNS).where(PriceHistory.product_id == Product.id)
+    if since is not None:
+        history = history.where(PriceHistory.checked_at >= _since_boundary(product_id, since))
+    if until is not None:
+        history = history.where(PriceHistory.checked_at < until)
+    if before is not None:
+        history = history.where(tuple_(PriceHistory.checked_at, PriceHistory.id) < tuple_(*before))
+    history = history.order_by(PriceHistory.checked_at.desc(), PriceHistory.id.desc())
+    if limit is not None:
+        history = history.limit(limit)
+
+    snapshots = history.subquery().lateral()
+    statement = (
+        select(Product.id.label("found_id"), *(snapshots.c[column.key] for column in HISTORY_READ_COLUMNS))
+        .outerjoin(snapshots, true())
+        .where(Product.id == product_id)
+        .order_by(snapshots.c.checked_at.desc(), snapshots.c.id.desc())
+    )
+    rows = (await session.execute(statement)).all()
+    if not rows:
+        return None
+    keys = [column.key for column in HISTORY_READ_COLUMNS]
+    return [{key: row._mapping[key] for key in keys} for row in rows if row.id is not None]
+
+
+async def stream_price_history(
+    session: AsyncSession,
+    *,
+    product_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of ``HISTORY_EXPORT_COLUMNS`` rows, oldest first per product.
+
+    Rows come from a server-side cursor ``batch_size`` at a time, so memory stays bounded
+    however much history matches. ``since``/``until`` select runs overlapping that window;
+    without ``product_id`` every product is exported.
+    """
+
+    statement = select(*HISTORY_EXPORT_COLUMNS)
+    if product_id is not None:
+        statement = statement.where(PriceHistory.product_id == product_id)
+    if since is not None:
+        statement = statement.where(PriceHistory.last_seen_at >= since)
+    if until is not None:
+        statement = statement.where(PriceHistory.checked_at < until)
+    statement = statement.order_by(
+        PriceHistory.product_id, PriceHistory.checked_at, PriceHistory.id
+    ).execution_options(yield_per=batch_size)
+
+    result = await session.stream(statement)
+    async for batch in result.partitions():
+        yield batch
+
+
+async def aggregate_price_history(
+    session: AsyncSession,
+    product_id: int,
+    bucket: str,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Sequence[Row] | None:
+    """Return OHLC rows per ``bucket`` (see ``HISTORY_BUCKET_UNITS``), or ``None`` if the product is missing.
+
+    Each row exposes ``bucket_start``, ``open``, ``close``, ``min``, ``max``, ``avg`` and ``samples``.
+    Runs are attributed to the bucket they start in and weighted by their number of checks;
+    buckets with no price change produce no row.
+    """
+
+    # Inline the unit so PostgreSQL can match the GROUP BY expression to the selected one.
+    unit = literal_column(f"'{HISTORY_BUCKET_UNITS[bucket]}'")
+    bucket_start = func.date_trunc(unit, PriceHistory.checked_at)
+    buckets = select(
+        bucket_start.label("bucket_start"),
+        func.array_agg(aggregate_order_by(PriceHistory.price, PriceHistory.checked_at.asc()))[1].label("open"),
+        func.array_agg(aggregate_order_by(PriceHistory.price, PriceHistory.checked_at.desc()))[1].label("close"),
+        func.min(PriceHistory.price).label("min"),
+        func.max(PriceHistory.price).label("max"),
+        func.round(
+            func.sum(PriceHistory.price * PriceHistory.check_count) / func.sum(PriceHistory.check_count),
+            2,
+        ).label("avg"),
+        func.sum(PriceHistory.check_count).label("samples"),
+    ).where(PriceHistory.product_id == Product.id)
+    if since is not None:
+        buckets = buckets.where(PriceHistory.checked_at >= _since_boundary(product_id, since))
+    if until is not None:
+        buckets = buckets.where(PriceHistory.checked_at < until)
+    buckets = buckets.group_by(bucket_start).subquery().lateral()
+
+    statement = (
+        select(Product.id, buckets)
+        .outerjoin(buckets, true())
+        .where(Product.id == product_id)
+        .order_by(buckets.c.bucket_start)
+    )
+    rows = (await session.execute(statement)).all()
+    if not rows:
+        return None
+    return [row for row in rows if row.bucket_start is not None]
+
+
+async def get_price_points(
+    session: AsyncSession,
+    product_id: int,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[tuple[datetime, Decimal]] | None:
+    """Return ``(time, price)`` tuples oldest first, or ``None`` if the product is missing.
+
+    Each run contributes its first check and, when it lasted longer, its last one, so the
+    series keeps the shape of flat stretches without one point per check.
+    """
+
+    points = select(PriceHistory.checked_at, PriceHistory.last_seen_at, PriceHistory.price).where(
+        PriceHistory.product_id == Product.id
+    )
+    if since is not None:
+        points = points.where(PriceHistory.checked_at >= _since_boundary(product_id, since))
+    if until is not None:
+        points = points.where(PriceHistory.checked_at < until)
+    points = points.subquery().lateral()
+
+    statement = (
+        select(Product.id, points.c.checked_at, points.c.last_seen_at, points.c.price)
+        .outerjoin(points, true())
+        .where(Product.id == product_id)
+        .order_by(points.c.checked_at)
+    )
+    rows = (await session.execute(statement)).all()
+    if not rows:
+        return None
+
+    series: list[tuple[datetime, Decimal]] = []
+    for row in rows:
+        if row.checked_at is None:
+            continue
+        series.append((row.checked_at, row.price))
+        if row.last_seen_at > row.checked_at:
+            series.append((row.last_seen_at, row.price))
+    return series
+
+
+async def get_price_stats(
+    session: AsyncSession,
+    product_ids: Sequence[int],
+    *,
+    now: datetime,
+) -> dict[int, dict[str, Any]]:
+    """Return ``PriceStats`` fields for each existing product in ``product_ids``, in one query.
+
+    The ``_90d`` fields cover runs seen within ``STATS_RANGE_WINDOW`` of ``now`` and the
+    ``_30d`` fields runs seen within ``STATS_RECENT_WINDOW``. Percentiles weight each run
+    by its number of checks, and volatility is the mean relative change per check, as in
+    :mod:`app.scheduling`. Each product's runs are read by an index range scan starting at
+    the run that was current when the range window opened.
+    """
+
+    if not product_ids:
+        return {}
+
+    range_since = now - STATS_RANGE_WINDOW
+    recent_since = now - STATS_RECENT_WINDOW
+    runs = (
+        select(
+            PriceHistory.price,
+            PriceHistory.check_count,
+            (PriceHistory.last_seen_at >= recent_since).label("recent"),
+            func.lag(PriceHistory.price)
+            .over(order_by=(PriceHistory.checked_at, PriceHistory.id))
+            .label("previous_price"),
+        )
+        .where(
+            PriceHistory.product_id == Product.id,
+            PriceHistory.checked_at >= _since_boundary(Product.id, range_since),
+            PriceHistory.checked_at <= now,
+        )
+        .subquery()
+        .lateral()
+    )
+    recent_checks = case((runs.c.recent, runs.c.check_count), else_=0)
+    ranked = (
+        select(
+            Product.id.label("product_id"),
+            Product.last_price,
+            runs.c.price,
+            runs.c.check_count,
+            runs.c.recent,
+            runs.c.previous_price,
+            func.sum(recent_checks)
+            .over(partition_by=Product.id, order_by=runs.c.price, rows=(None, 0))
+            .label("cumulative_checks"),
+            func.sum(recent_checks).over(partition_by=Product.id).label("recent_checks"),
+        )
+        .outerjoin(runs, true())
+        .where(Product.id.in_(product_ids))
+        .subquery()
     )
+
+    def percentile(fraction: str) -> ColumnElement[Decimal]:
+        reached = ranked.c.cumulative_checks >= ranked.c.recent_checks * literal_column(fraction)
+        return func.min(ranked.c.price).filter(ranked.c.recent, reached)
+
+    median = percentile("0.5")
+    changes = func.sum(func.abs(ranked.c.price - ranked.c.previous_price) / ranked.c.previous_price).filter(
+        ranked.c.recent, ranked.c.previous_price > 0
+    )
+    checks = func.sum(ranked.c.check_count).filter(ranked.c.recent)
+    statement = select(
+        ranked.c.product_id,
+        ranked.c.last_price.label("current_price"),
+        func.min(ranked.c.price).label("low_90d"),
+        func.max(ranked.c.price).label("high_90d"),
+        percentile("0.1").label("p10_30d"),
+        median.label("median_30d"),
+        percentile("0.9").label("p90_30d"),
+        func.round((median - ranked.c.last_price) * 100 / func.nullif(median, 0), 2).label("drop_from_median_30d_pct"),
+        func.round(func.coalesce(changes, 0) / func.nullif(checks, 0), 6).label("volatility_30d"),
+        func.coalesce(checks, 0).label("samples_30d"),
+    ).group_by(ranked.c.product_id, ranked.c.last_price)
+
     result = await session.execute(statement)
-    return result.scalars().all()
+    return {row["product_id"]: {**row, "as_of": now} for row in result.mappings()}
 
 
 async def insert_price(
@@ -74,22 +651,646 @@ async def insert_price(
     *,
     commit: bool = True,
 ) -> PriceHistory:
-    """Insert a new price history entry and update the product's last price."""
+    """Record a price check and update the product's last price and price summary.
+
+    With ``settings.price_history_change_only`` an unchanged price extends the latest run
+    instead of inserting a row. Returns the run the check was recorded in. Cached
+    responses are invalidated as in :func:`create_product`, and target price alerts
+    are delivered on commit; with ``commit=False`` call :func:`app.alerts.dispatch_pending`
+    after committing.
+    """
 
     product = await session.get(Product, product_id)
     if product is None:
         raise ValueError(f"Product {product_id} not found")
 
     price_value = _to_decimal(price)
-    entry = PriceHistory(product_id=product_id, price=price_value)
-    session.add(entry)
+    now = datetime.utcnow()
+    entry = None
+    if settings.price_history_change_only and product.last_price == price_value:
+        statement = (
+            select(PriceHistory)
+            .where(PriceHistory.product_id == product_id)
+            .order_by(PriceHistory.checked_at.desc(), PriceHistory.id.desc())
+            .limit(1)
+        )
+        entry = await session.scalar(statement)
+        if entry is not None and entry.price == price_value and entry.last_seen_at <= now:
+            entry.last_seen_at = now
+            entry.check_count += 1
+        else:
+            entry = None
+
+    if entry is None:
+        entry = PriceHistory(product_id=product_id, price=price_value, checked_at=now, last_seen_at=now)
+        session.add(entry)
+    if product.last_price != price_value:
+        product.price_changed_at = now
     product.last_price = price_value
+    # SQL expressions keep the running summary correct under concurrent checks.
+    product.lowest_price = func.least(Product.lowest_price, price_value)
+    product.highest_price = func.greatest(Product.highest_price, price_value)
+    product.recent_price_total = Product.recent_price_total + price_value
+    product.recent_check_count = Product.recent_check_count + 1
+    cache.mark_stale(session, products=True, product_ids=[product_id])
+    if _may_cross_target(price_value, product.target_price, product.target_alerted_at):
+        await record_target_crossings(session, {product_id: price_value}, now=now)
 
     if commit:
         await session.commit()
+        await cache.invalidate_stale(session)
+        await alerts.dispatch_pending(session)
         await session.refresh(entry)
         await session.refresh(product)
     else:
         await session.flush()
 
     return entry
+
+
+def _may_cross_target(lowest: Decimal, target_price: Decimal | None, alerted_at: datetime | None) -> bool:
+    """Return whether a write with ``lowest`` as its lowest price changes the product's alert state."""
+
+    if target_price is None:
+        return False
+    return (lowest <= target_price) == (alerted_at is None)
+
+
+async def record_target_crossings(
+    session: AsyncSession,
+    lowest_prices: Mapping[int, Decimal],
+    *,
+    now: datetime,
+) -> list[PriceAlert]:
+    """Queue alerts for products whose target price was reached by the prices just written.
+
+    ``lowest_prices`` maps products to the lowest price of the write. One
+    ``UPDATE ... FROM (VALUES ...)`` per chunk sets ``target_alerted_at`` when a price
+    reaches the target with no alert outstanding, and clears it when a write stays above
+    the target, re-arming the alert. Only the first edge produces an alert, so repeated
+    checks at or below the target stay quiet, and the row lock taken by the update lets
+    only one concurrent writer fire it. Alerts are delivered by
+    :func:`app.alerts.dispatch_pending` after commit.
+    """
+
+    fired: list[PriceAlert] = []
+    pending = list(lowest_prices.items())
+    for start in range(0, len(pending), BULK_UPDATE_CHUNK_SIZE):
+        chunk = pending[start : start + BULK_UPDATE_CHUNK_SIZE]
+        lowest = values(
+            column("id", Integer),
+            column("price", Numeric(10, 2)),
+            name="lowest",
+        ).data(chunk)
+        reached = lowest.c.price <= Product.target_price
+        statement = (
+            update(Product)
+            .where(
+                Product.id == lowest.c.id,
+                Product.target_price.is_not(None),
+                or_(
+                    and_(reached, Product.target_alerted_at.is_(None)),
+                    and_(~reached, Product.target_alerted_at.is_not(None)),
+                ),
+            )
+            .values(target_alerted_at=case((reached, now), else_=None), updated_at=Product.updated_at)
+            .returning(
+                Product.id,
+                Product.name,
+                Product.url,
+                Product.currency,
+                Product.target_price,
+                Product.target_alerted_at,
+                lowest.c.price,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+        fired.extend(
+            PriceAlert(
+                product_id=row.id,
+                name=row.name,
+                url=row.url,
+                price=row.price,
+                target_price=row.target_price,
+                currency=row.currency,
+                triggered_at=row.target_alerted_at,
+            )
+            for row in result
+            if row.target_alerted_at is not None
+        )
+    alerts.queue_alerts(session, fired)
+    return fired
+
+
+async def _latest_runs(session: AsyncSession, product_ids: Sequence[int]) -> dict[int, dict]:
+    """Return each product's most recent history run, read with ``DISTINCT ON`` from the covering index."""
+
+    statement = (
+        select(
+            PriceHistory.id,
+            PriceHistory.product_id,
+            PriceHistory.price,
+            PriceHistory.checked_at,
+            PriceHistory.last_seen_at,
+            PriceHistory.check_count,
+        )
+        .where(PriceHistory.product_id.in_(product_ids))
+        .distinct(PriceHistory.product_id)
+        .order_by(PriceHistory.product_id, PriceHistory.checked_at.desc(), PriceHistory.id.desc())
+    )
+    result = await session.execute(statement)
+    return {row.product_id: dict(row._mapping) for row in result}
+
+
+def _merge_into_runs(rows: list[dict], tails: dict[int, dict]) -> tuple[list[dict], list[dict]]:
+    """Fold time-ordered observations into runs, returning ``(new_runs, extended_existing_runs)``.
+
+    An observation equal in price to its product's latest run, and not older than it,
+    extends that run; anything else starts a new run. Late observations that predate the
+    latest run are stored as their own single-check runs.
+    """
+
+    new_runs: list[dict] = []
+    extended: dict[int, dict] = {}
+    for row in sorted(rows, key=lambda item: (item["product_id"], item["checked_at"])):
+        tail = tails.get(row["product_id"])
+        if tail is not None and row["checked_at"] < tail["last_seen_at"]:
+            new_runs.append({**row, "last_seen_at": row["checked_at"], "check_count": 1})
+            continue
+        if tail is not None and tail["price"] == row["price"]:
+            tail["last_seen_at"] = row["checked_at"]
+            tail["check_count"] += 1
+            if "id" in tail:
+                extended[tail["id"]] = tail
+            continue
+        run = {**row, "last_seen_at": row["checked_at"], "check_count": 1}
+        new_runs.append(run)
+        tails[row["product_id"]] = run
+    return new_runs, list(extended.values())
+
+
+def _summarise_observations(rows: list[dict], *, recent_since: datetime) -> dict[int, dict[str, Any]]:
+    """Fold each product's observations into the running summary deltas applied to ``products``.
+
+    ``changed_at`` is the newest observation whose price differs from the one before it
+    in the batch; whether the first observation changed the price is decided in SQL.
+    """
+
+    summaries: dict[int, dict[str, Any]] = {}
+    for row in sorted(rows, key=lambda item: (item["product_id"], item["checked_at"])):
+        summary = summaries.get(row["product_id"])
+        if summary is None:
+            summary = summaries[row["product_id"]] = {
+                "first": row,
+                "newest": row,
+                "low": row["price"],
+                "high": row["price"],
+                "recent_total": Decimal(0),
+                "recent_checks": 0,
+                "changed_at": None,
+            }
+        else:
+            if row["price"] != summary["newest"]["price"]:
+                summary["changed_at"] = row["checked_at"]
+            summary["newest"] = row
+            summary["low"] = min(summary["low"], row["price"])
+            summary["high"] = max(summary["high"], row["price"])
+        if row["checked_at"] >= recent_since:
+            summary["recent_total"] += row["price"]
+            summary["recent_checks"] += 1
+    return summaries
+
+
+async def insert_prices_bulk(
+    session: AsyncSession,
+    observations: Iterable[PriceObservation],
+    *,
+    commit: bool = True,
+) -> int:
+    """Record many ``(product_id, price, checked_at)`` observations in one transaction.
+
+    Each product's ``last_price`` and price summary are updated from its observations with
+    a single ``UPDATE ... FROM (VALUES ...)`` per chunk, and history rows are written as multi-row
+    INSERTs. ``last_price`` and ``price_changed_at`` only move when a product's newest
+    observation is not older than its latest stored check, so backfills keep the current
+    price. With ``settings.price_history_change_only`` unchanged prices extend existing
+    runs instead. A missing ``checked_at`` defaults to now. Raises ``ValueError`` listing
+    unknown product ids before any history is written; the caller must then roll the
+    session back. Returns the number of observations recorded. Cached responses and
+    target price alerts are handled as in :func:`insert_price`.
+    """
+
+    now = datetime.utcnow()
+    rows = [
+        {"product_id": product_id, "price": _to_decimal(price), "checked_at": checked_at or now}
+        for product_id, price, checked_at in observations
+    ]
+    if not rows:
+        return 0
+
+    summaries = _summarise_observations(rows, recent_since=now - STATS_RECENT_WINDOW)
+    latest = {product_id: summary["newest"] for product_id, summary in summaries.items()}
+
+    updated: set[int] = set()
+    crossings: dict[int, Decimal] = {}
+    pending = list(summaries.items())
+    for start in range(0, len(pending), PRICE_SUMMARY_CHUNK_SIZE):
+        chunk = pending[start : start + PRICE_SUMMARY_CHUNK_SIZE]
+        newest = values(
+            column("id", Integer),
+            column("price", Numeric(10, 2)),
+            column("low", Numeric(10, 2)),
+            column("high", Numeric(10, 2)),
+            column("recent_total", Numeric(14, 2)),
+            column("recent_checks", Integer),
+            column("checked_at", DateTime()),
+            column("first_price", Numeric(10, 2)),
+            column("first_checked_at", DateTime()),
+            column("changed_at", DateTime()),
+            name="newest",
+        ).data(
+            [
+                (
+                    product_id,
+                    summary["newest"]["price"],
+                    summary["low"],
+                    summary["high"],
+                    summary["recent_total"],
+                    summary["recent_checks"],
+                    summary["newest"]["checked_at"],
+                    summary["first"]["price"],
+                    summary["first"]["checked_at"],
+                    summary["changed_at"],
+                )
+                for product_id, summary in chunk
+            ]
+        )
+        # Backfilled observations older than the latest stored check leave the current
+        # price alone; history is written after this update, so it reads the stored runs.
+        latest_seen = (
+            select(PriceHistory.last_seen_at)
+            .where(PriceHistory.product_id == Product.id)
+            .order_by(PriceHistory.checked_at.desc(), PriceHistory.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        current = or_(latest_seen.is_(None), newest.c.checked_at >= latest_seen)
+        # A change inside the batch wins; otherwise the first observation changed the
+        # price if it differs from the stored last price (SET reads the old row).
+        changed_at = func.coalesce(
+            # Untyped when every row is NULL, so PostgreSQL would read the column as text.
+            cast(newest.c.changed_at, DateTime()),
+            case(
+                (Product.last_price.is_distinct_from(newest.c.first_price), newest.c.first_checked_at),
+                else_=Product.price_changed_at,
+            ),
+        )
+        statement = (
+            update(Product)
+            .where(Product.id == newest.c.id)
+            .values(
+                last_price=case((current, newest.c.price), else_=Product.last_price),
+                lowest_price=func.least(Product.lowest_price, newest.c.low),
+                highest_price=func.greatest(Product.highest_price, newest.c.high),
+                recent_price_total=Product.recent_price_total + newest.c.recent_total,
+                recent_check_count=Product.recent_check_count + newest.c.recent_checks,
+                price_changed_at=case((current, changed_at), else_=Product.price_changed_at),
+                updated_at=now,
+            )
+            .returning(Product.id, Product.target_price, Product.target_alerted_at, current.label("current"))
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+        for product_id, target_price, alerted_at, is_current in result:
+            updated.add(product_id)
+            # Alerts follow the current price, so backfills never fire them.
+            if is_current and _may_cross_target(summaries[product_id]["low"], target_price, alerted_at):
+                crossings[product_id] = summaries[product_id]["low"]
+
+    missing = latest.keys() - updated
+    if missing:
+        raise ValueError(f"Products not found: {', '.join(map(str, sorted(missing)))}")
+
+    if settings.price_history_change_only:
+        new_runs, extended = _merge_into_runs(rows, await _latest_runs(session, list(latest)))
+    else:
+        new_runs = [{**row, "last_seen_at": row["checked_at"], "check_count": 1} for row in rows]
+        extended = []
+
+    for start in range(0, len(extended), BULK_UPDATE_CHUNK_SIZE):
+        chunk = extended[start : start + BULK_UPDATE_CHUNK_SIZE]
+        stretched = values(
+            column("id", Integer),
+            column("checked_at", DateTime()),
+            column("last_seen_at", DateTime()),
+            column("check_count", Integer),
+            name="stretched",
+        ).data([(run["id"], run["checked_at"], run["last_seen_at"], run["check_count"]) for run in chunk])
+        await session.execute(
+            update(PriceHistory)
+            .where(PriceHistory.id == stretched.c.id, PriceHistory.checked_at == stretched.c.checked_at)
+            .values(last_seen_at=stretched.c.last_seen_at, check_count=stretched.c.check_count)
+            .execution_options(synchronize_session=False)
+        )
+    if new_runs:
+        await session.execute(insert(PriceHistory), new_runs)
+    cache.mark_stale(session, products=True, product_ids=latest)
+    if crossings:
+        await record_target_crossings(session, crossings, now=now)
+
+    if commit:
+        await session.commit()
+        await cache.invalidate_stale(session)
+        await alerts.dispatch_pending(session)
+    else:
+        await session.flush()
+
+    return len(rows)
+
+
+def _history_source(source: str) -> Any:
+    """Return ``source`` (``price_history`` or one of its partitions) as a lightweight table."""
+
+    return table(
+        source,
+        column("id", Integer),
+        column("product_id", Integer),
+        column("price", Numeric(10, 2)),
+        column("checked_at", DateTime()),
+        column("last_seen_at", DateTime()),
+        column("check_count", Integer),
+    )
+
+
+def _check_index(runs: Any, moment: ColumnElement[datetime]) -> ColumnElement[int]:
+    """Return the index of a run's first check at or after ``moment``, or ``check_count`` if none.
+
+    Checks are taken as evenly spaced across the run, as in :func:`_checks_since`.
+    """
+
+    elapsed = func.extract("epoch", moment - runs.c.checked_at)
+    span = func.extract("epoch", runs.c.last_seen_at - runs.c.checked_at)
+    return case(
+        (moment <= runs.c.checked_at, 0),
+        (moment > runs.c.last_seen_at, runs.c.check_count),
+        else_=cast(func.ceil((runs.c.check_count - 1) * elapsed / span), Integer),
+    )
+
+
+def _check_time(runs: Any, index: ColumnElement[int]) -> ColumnElement[datetime]:
+    """Return when a run's check number ``index`` was made, with checks evenly spaced."""
+
+    fraction = cast(index, Numeric) / func.nullif(runs.c.check_count - 1, 0)
+    return runs.c.checked_at + (runs.c.last_seen_at - runs.c.checked_at) * func.coalesce(fraction, 0)
+
+
+async def split_runs_at(session: AsyncSession, source: str, *, at: datetime) -> int:
+    """Split runs in ``source`` that started before ``at`` but were still seen at or after it.
+
+    Their checks from ``at`` on move to a new run starting at the first of those checks,
+    inserted through ``price_history`` so it lands in the partition covering it, and the
+    original run is cut short at its last check before ``at``. Retention can then drop
+    everything that started before ``at`` without losing a product's current run.
+    Returns the number of runs split.
+    """
+
+    runs = _history_source(source)
+    straddling = and_(runs.c.checked_at < at, runs.c.last_seen_at >= at)
+    carried = _check_index(runs, literal(at, DateTime()))
+    continuation = select(
+        runs.c.product_id,
+        runs.c.price,
+        # Never before ``at``, or the row would route back into ``source``.
+        func.greatest(_check_time(runs, carried), at),
+        runs.c.last_seen_at,
+        runs.c.check_count - carried,
+    ).where(straddling)
+    await session.execute(
+        insert(PriceHistory).from_select(
+            ["product_id", "price", "checked_at", "last_seen_at", "check_count"],
+            continuation,
+        )
+    )
+
+    kept = _check_index(runs, literal(at, DateTime()))
+    statement = (
+        update(runs)
+        .where(straddling)
+        .values(last_seen_at=_check_time(runs, kept - 1), check_count=kept)
+    )
+    result = await session.execute(statement)
+    return result.rowcount
+
+
+async def rollup_price_history_daily(session: AsyncSession, source: str, *, before: datetime) -> int:
+    """Summarise runs in ``source`` that started before ``before`` into ``price_history_daily``.
+
+    ``source`` is ``price_history`` or one of its partitions. A run's checks are spread
+    evenly from ``checked_at`` to ``last_seen_at`` and counted in the days they fall on, so
+    split runs crossing ``before`` with :func:`split_runs_at` first. Days that already have
+    a summary are merged with it, so a day rolled up in several passes ends up the same as
+    one rolled up at once. Returns the number of daily rows written.
+    """
+
+    runs = _history_source(source)
+    one_day = literal_column("interval '1 day'")
+    day = func.generate_series(
+        func.date_trunc(literal_column("'day'"), runs.c.checked_at),
+        func.date_trunc(literal_column("'day'"), runs.c.last_seen_at),
+        one_day,
+    ).column_valued("day", joins_implicitly=True)
+    first = _check_index(runs, day)
+    following = _check_index(runs, day + one_day)
+    checks = (
+        select(
+            runs.c.id,
+            runs.c.product_id,
+            runs.c.price,
+            day.label("day"),
+            (following - first).label("checks"),
+            _check_time(runs, first).label("first_at"),
+            _check_time(runs, following - 1).label("last_at"),
+        )
+        .where(runs.c.checked_at < before)
+        .subquery()
+    )
+    summary = (
+        select(
+            checks.c.product_id,
+            cast(checks.c.day, Date),
+            func.array_agg(aggregate_order_by(checks.c.price, checks.c.first_at.asc(), checks.c.id.asc()))[1],
+            func.array_agg(aggregate_order_by(checks.c.price, checks.c.last_at.desc(), checks.c.id.desc()))[1],
+            func.min(checks.c.price),
+            func.max(checks.c.price),
+            func.round(func.sum(checks.c.price * checks.c.checks) / func.sum(checks.c.checks), 2),
+            func.sum(checks.c.checks),
+            func.min(checks.c.first_at),
+            func.max(checks.c.last_at),
+        )
+        # Runs checked less often than daily skip some of the days they span.
+        .where(checks.c.checks > 0)
+        .group_by(checks.c.product_id, checks.c.day)
+    )
+
+    daily = PriceHistoryDaily.__table__
+    statement = pg_insert(PriceHistoryDaily).from_select(
+        [
+            "product_id",
+            "day",
+            "open_price",
+            "close_price",
+            "min_price",
+            "max_price",
+            "avg_price",
+            "samples",
+            "first_checked_at",
+            "last_checked_at",
+        ],
+        summary,
+    )
+    merged_samples = daily.c.samples + statement.excluded.samples
+    statement = statement.on_conflict_do_update(
+        index_elements=[daily.c.product_id, daily.c.day],
+        set_={
+            "open_price": case(
+                (statement.excluded.first_checked_at < daily.c.first_checked_at, statement.excluded.open_price),
+                else_=daily.c.open_price,
+            ),
+            "close_price": case(
+                (statement.excluded.last_checked_at > daily.c.last_checked_at, statement.excluded.close_price),
+                else_=daily.c.close_price,
+            ),
+            "min_price": func.least(daily.c.min_price, statement.excluded.min_price),
+            "max_price": func.greatest(daily.c.max_price, statement.excluded.max_price),
+            "avg_price": func.round(
+                (
+                    daily.c.avg_price * daily.c.samples
+                    + statement.excluded.avg_price * statement.excluded.samples
+                )
+                / merged_samples,
+                2,
+            ),
+            "samples": merged_samples,
+            "first_checked_at": func.least(daily.c.first_checked_at, statement.excluded.first_checked_at),
+            "last_checked_at": func.greatest(daily.c.last_checked_at, statement.excluded.last_checked_at),
+        },
+    )
+    result = await session.execute(statement)
+    return result.rowcount
+
+
+def _checks_since(since: datetime) -> ColumnElement[int]:
+    """Return how many of a run's checks were made at or after ``since``.
+
+    Checks are taken as evenly spaced across the run, as when runs are expanded for the
+    API. Only valid for runs last seen at or after ``since``.
+    """
+
+    before = func.extract("epoch", since - PriceHistory.checked_at)
+    span = func.extract("epoch", PriceHistory.last_seen_at - PriceHistory.checked_at)
+    return case(
+        (PriceHistory.checked_at >= since, PriceHistory.check_count),
+        else_=PriceHistory.check_count - cast(func.ceil((PriceHistory.check_count - 1) * before / span), Integer),
+    )
+
+
+async def refresh_recent_price_totals(session: AsyncSession, *, now: datetime) -> int:
+    """Recompute every product's running 30-day totals from history, dropping checks that aged out.
+
+    Inserts only ever add to the totals, so this runs periodically to trim them. Each
+    product's runs are read by an index range scan from the run current when the window
+    opened, and products whose totals are unchanged are not rewritten. Returns the number
+    of products updated.
+    """
+
+    since = now - STATS_RECENT_WINDOW
+    owner = aliased(Product)
+    checks = _checks_since(since)
+    runs = (
+        select(
+            func.coalesce(func.sum(PriceHistory.price * checks), 0).label("total"),
+            func.coalesce(func.sum(checks), 0).label("checks"),
+        )
+        .where(
+            PriceHistory.product_id == owner.id,
+            PriceHistory.checked_at >= _since_boundary(owner.id, since),
+            PriceHistory.last_seen_at >= since,
+        )
+        .subquery()
+        .lateral()
+    )
+    totals = select(owner.id, runs.c.total, runs.c.checks).join(runs, true()).subquery()
+    statement = (
+        update(Product)
+        .where(
+            Product.id == totals.c.id,
+            or_(Product.recent_price_total != totals.c.total, Product.recent_check_count != totals.c.checks),
+        )
+        .values(
+            recent_price_total=totals.c.total,
+            recent_check_count=totals.c.checks,
+            updated_at=Product.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+    if result.rowcount:
+        cache.mark_stale(session, products=True)
+    return result.rowcount
+
+
+async def rebuild_price_summaries(session: AsyncSession, *, now: datetime) -> int:
+    """Recompute every product's price summary from history and the daily rollups.
+
+    Used to backfill the summary columns; inserts keep them current afterwards. Changes
+    that were only recorded in rolled-up days keep the stored ``price_changed_at``.
+    Returns the number of products with history.
+    """
+
+    marked = select(
+        PriceHistory.product_id,
+        PriceHistory.price,
+        PriceHistory.checked_at,
+        func.lag(PriceHistory.price)
+        .over(partition_by=PriceHistory.product_id, order_by=(PriceHistory.checked_at, PriceHistory.id))
+        .label("previous_price"),
+    ).subquery()
+    history = select(
+        marked.c.product_id,
+        func.min(marked.c.price).label("low"),
+        func.max(marked.c.price).label("high"),
+        func.max(marked.c.checked_at).filter(marked.c.previous_price.is_distinct_from(marked.c.price)).label("changed_at"),
+    ).group_by(marked.c.product_id)
+    rolled_up = select(
+        PriceHistoryDaily.product_id,
+        func.min(PriceHistoryDaily.min_price),
+        func.max(PriceHistoryDaily.max_price),
+        cast(null(), DateTime()),
+    ).group_by(PriceHistoryDaily.product_id)
+    combined = union_all(history, rolled_up).subquery()
+    summary = (
+        select(
+            combined.c.product_id,
+            func.min(combined.c.low).label("low"),
+            func.max(combined.c.high).label("high"),
+            func.max(combined.c.changed_at).label("changed_at"),
+        )
+        .group_by(combined.c.product_id)
+        .subquery()
+    )
+    statement = (
+        update(Product)
+        .where(Product.id == summary.c.product_id)
+        .values(
+            lowest_price=summary.c.low,
+            highest_price=summary.c.high,
+            price_changed_at=func.coalesce(summary.c.changed_at, Product.price_changed_at),
+            updated_at=Product.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+    await refresh_recent_price_totals(session, now=now)
+    cache.mark_stale(session, products=True)
+    return result.rowcount
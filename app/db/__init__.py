@@ -1,5 +1,5 @@
 """Database utilities for the PricePulse backend."""
 
-from .session import async_engine, get_async_session
+from .session import async_engine, get_async_session, get_read_session
 
-__all__ = ["async_engine", "get_async_session"]
+__all__ = ["async_engine", "get_async_session", "get_read_session"]
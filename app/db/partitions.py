@@ -0,0 +1,189 @@
+"""Monthly range partitions of the ``price_history`` table."""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "price_history"
+# Catches rows outside every monthly range (e.g. ingested from the distant past) so writes never fail.
+DEFAULT_PARTITION = "price_history_default"
+_PARTITION_NAME = re.compile(r"^price_history_(\d{4})(\d{2})$")
+# How long detaching an expired partition waits for its brief lock on the parent table
+# before giving up until the next run, rather than queueing every history read behind it.
+DETACH_LOCK_TIMEOUT = "5s"
+_LOCK_NOT_AVAILABLE = "55P03"
+
+
+def month_start(moment: datetime) -> datetime:
+    """Return midnight on the first day of ``moment``'s month."""
+
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """Return the start of the month ``count`` months after ``month``."""
+
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_{month:%Y%m}"
+
+
+async def list_partitions(session: AsyncSession) -> list[datetime]:
+    """Return the start of every month that has its own partition, oldest first."""
+
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    months = []
+    for name in result.scalars():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(datetime(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def create_partition(session: AsyncSession, month: datetime) -> None:
+    """Create the partition for ``month``, moving any matching rows out of the default partition.
+
+    PostgreSQL refuses to add a partition whose range already has rows in the default
+    partition, so those are copied into a detached table that is then attached.
+    """
+
+    name = partition_name(month)
+    bounds = f"FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    in_range = "checked_at >= :start AND checked_at < :end"
+    params = {"start": month, "end": add_months(month, 1)}
+
+    stray = await session.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"),
+        params,
+    )
+    if not stray:
+        await session.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} FOR VALUES {bounds}"))
+        return
+
+    await session.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    await session.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+    await session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+    await session.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    logger.info("Moved rows for %s out of %s", name, DEFAULT_PARTITION)
+
+
+async def ensure_partitions(session: AsyncSession, *, now: datetime, months_ahead: int) -> list[str]:
+    """Create any missing partitions from the current month to ``months_ahead`` months out.
+
+    Each partition is committed on its own so a failure leaves earlier ones in place.
+    Returns the names of the partitions created.
+    """
+
+    existing = set(await list_partitions(session))
+    current = month_start(now)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        await create_partition(session, month)
+        await session.commit()
+        created.append(partition_name(month))
+    return created
+
+
+async def list_detached_partitions(session: AsyncSession) -> list[datetime]:
+    """Return the months of monthly tables left detached, e.g. by an interrupted expiry run."""
+
+    result = await session.execute(
+        text(
+            "SELECT relname FROM pg_class"
+            " WHERE relkind = 'r' AND NOT relispartition AND relnamespace = CAST(current_schema() AS regnamespace)"
+        )
+    )
+    months = []
+    for name in result.scalars():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(datetime(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def _detach_partition(session: AsyncSession, name: str) -> bool:
+    """Detach ``name`` in its own short transaction; return ``False`` if its lock timed out.
+
+    ``DETACH ... CONCURRENTLY`` is refused while a default partition exists, so this takes
+    the parent's lock for a catalogue change only, bounded by ``DETACH_LOCK_TIMEOUT``.
+    """
+
+    try:
+        await session.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+        await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        await session.commit()
+    except DBAPIError as exc:
+        await session.rollback()
+        if getattr(exc.orig, "sqlstate", None) != _LOCK_NOT_AVAILABLE:
+            raise
+        logger.warning("Could not lock %s to detach %s within %s; retrying next run", PARENT_TABLE, name, DETACH_LOCK_TIMEOUT)
+        return False
+    return True
+
+
+async def _expire_detached(session: AsyncSession, month: datetime) -> str:
+    """Split, roll up and drop the detached table of ``month`` in one transaction."""
+
+    name = partition_name(month)
+    end = add_months(month, 1)
+    await crud.split_runs_at(session, name, at=end)
+    await crud.rollup_price_history_daily(session, name, before=end)
+    await session.execute(text(f"DROP TABLE {name}"))
+    await session.commit()
+    return name
+
+
+async def drop_expired_partitions(session: AsyncSession, *, cutoff: datetime) -> list[str]:
+    """Roll up and drop every partition whose whole range is older than ``cutoff``.
+
+    Rows in the default partition older than ``cutoff`` are rolled up and deleted too.
+    Runs still current past a dropped range are split first, carrying their later checks
+    forward, so a price that has held for longer than the retention period stays in
+    history. Each partition is first detached in a short transaction of its own, so the
+    rollup and drop never hold a lock on ``price_history``; the detached table is then
+    split, rolled up and dropped in one transaction, so history is never lost without
+    its daily summary. Tables a failed run left detached are finished first. Returns the
+    names of the partitions dropped.
+    """
+
+    dropped = []
+    for month in await list_detached_partitions(session):
+        if add_months(month, 1) <= cutoff:
+            dropped.append(await _expire_detached(session, month))
+
+    for month in await list_partitions(session):
+        if add_months(month, 1) > cutoff:
+            break
+        if not await _detach_partition(session, partition_name(month)):
+            break
+        dropped.append(await _expire_detached(session, month))
+
+    await crud.split_runs_at(session, DEFAULT_PARTITION, at=cutoff)
+    rolled = await crud.rollup_price_history_daily(session, DEFAULT_PARTITION, before=cutoff)
+    if rolled:
+        await session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE checked_at < :cutoff"), {"cutoff": cutoff})
+    await session.commit()
+    return dropped
@@ -1,22 +1,178 @@
-"""Async database session management."""
+"""Async database session management, with optional read replica routing."""
 
-from collections.abc import AsyncGenerator
+import logging
+import time
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any
 
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
+from app.core import metrics, profiling
 from app.core.config import settings
 from app.db.base import Base
 
-async_engine: AsyncEngine = create_async_engine(
-    settings.sqlalchemy_async_database_url,
-    echo=settings.database_echo,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    pool_timeout=settings.database_pool_timeout,
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "pricepulse_read_primary"
+# How often each replica's replication lag is measured when a read session picks it.
+LAG_CHECK_SECONDS = 5.0
+# Zero on a primary or a replica that has replayed everything it received, since the
+# last replayed transaction's age only measures write inactivity there.
+_REPLICATION_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
 )
+
+
+def build_async_engine(url: str | None = None, *, name: str = "primary") -> AsyncEngine:
+    """Build an async engine from the configured database settings, with metrics and slow query logging.
+
+    ``url`` defaults to the primary database; ``name`` labels the engine's pool metrics.
+    """
+
+    options = {"poolclass": metrics.InstrumentedQueuePool} if settings.metrics_enabled else {}
+    engine = create_async_engine(
+        url or settings.sqlalchemy_async_database_url,
+        echo=settings.database_echo,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        **options,
+    )
+    if settings.metrics_enabled:
+        metrics.instrument_engine(engine, name)
+    if settings.slow_query_ms is not None:
+        profiling.log_slow_queries(engine)
+    return engine
+
+
+async_engine: AsyncEngine = build_async_engine()
 SessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
+class ReadSession(Session):
+    """Session bound to the replica :class:`ReplicaPool` picks when its first query needs a connection.
+
+    Routes answered from the response cache never query, so they never touch a database.
+    """
+
+    _read_engine: Engine | None = None
+
+    def get_bind(self, mapper: Any = None, **kwargs: Any) -> Engine:
+        if self._read_engine is None:
+            self._read_engine = replicas.choose() or async_engine.sync_engine
+        return self._read_engine
+
+
+ReadSessionLocal = async_sessionmaker(sync_session_class=ReadSession, expire_on_commit=False)
+
+
+class ReplicaPool:
+    """Read replica engines used round-robin, skipping failed or lagging ones for a while."""
+
+    def __init__(self, engines: Sequence[AsyncEngine]) -> None:
+        self.engines = list(engines)
+        self._next = 0
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._lag_checked_at: dict[AsyncEngine, float] = {}
+
+    def candidates(self) -> list[AsyncEngine]:
+        """Return the usable replicas, starting one further along than the previous call."""
+
+        if not self.engines:
+            return []
+        start = self._next
+        self._next = (start + 1) % len(self.engines)
+        now = time.monotonic()
+        ordered = self.engines[start:] + self.engines[:start]
+        return [engine for engine in ordered if self._down_until.get(engine, 0.0) <= now]
+
+    def mark_down(self, engine: AsyncEngine, reason: object) -> None:
+        """Skip ``engine`` for ``settings.database_read_retry_seconds``."""
+
+        self._down_until[engine] = time.monotonic() + settings.database_read_retry_seconds
+        logger.warning(
+            "Skipping read replica %s for %ss: %s",
+            engine.url.render_as_string(hide_password=True),
+            settings.database_read_retry_seconds,
+            reason,
+        )
+
+    def _lag(self, engine: AsyncEngine) -> float:
+        """Check out a connection to ``engine`` and return its lag, or 0 when it was checked recently."""
+
+        with engine.sync_engine.connect() as connection:
+            if time.monotonic() - self._lag_checked_at.get(engine, float("-inf")) < LAG_CHECK_SECONDS:
+                return 0.0
+            self._lag_checked_at[engine] = time.monotonic()
+            return float(connection.scalar(_REPLICATION_LAG))
+
+    def choose(self) -> Engine | None:
+        """Return the sync engine of a healthy replica, or ``None`` when none is usable.
+
+        Called by :class:`ReadSession` from inside the async session's greenlet, where
+        blocking calls on the engine run on the event loop.
+        """
+
+        for engine in self.candidates():
+            try:
+                # The checked-out connection goes back to the pool for the session to reuse,
+                # so an unreachable replica fails over before the route's first query.
+                lag = self._lag(engine)
+            except PoolTimeoutError:
+                # A busy replica is healthy; let the next one take this request.
+                continue
+            except (SQLAlchemyError, OSError) as exc:
+                self.mark_down(engine, exc)
+                continue
+            if lag > settings.database_read_max_lag_seconds:
+                self.mark_down(engine, f"{lag:.1f}s behind the primary")
+                continue
+            return engine.sync_engine
+        return None
+
+
+replicas = ReplicaPool(
+    [build_async_engine(url, name=f"replica-{index}") for index, url in enumerate(settings.sqlalchemy_async_read_urls)]
+)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Return whether ``request`` comes from a client pinned by :func:`pin_reads_to_primary`."""
+
+    return READ_PRIMARY_COOKIE in request.cookies
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    """Route the client's reads to the primary for a few seconds, so it sees its own write."""
+
+    if replicas.engines and settings.database_read_your_writes_seconds:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=settings.database_read_your_writes_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def open_read_session(*, primary: bool = False) -> AsyncSession:
+    """Open a session for read-only work on a replica, falling back to the primary.
+
+    The replica is chosen, and connected to, only once the session runs its first query.
+    """
+
+    if primary or not replicas.engines:
+        return SessionLocal()
+    return ReadSessionLocal()
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Yield a per-request async database session."""
 
@@ -24,6 +180,13 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a per-request session for read-only routes, on a replica when one is configured."""
+
+    async with open_read_session(primary=reads_from_primary(request)) as session:
+        yield session
+
+
 async def init_database() -> None:
     """Initialise database metadata if needed."""
 
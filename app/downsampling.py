@@ -0,0 +1,56 @@
+"""Shape-preserving downsampling for price series."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+
+PricePoint = tuple[datetime, Decimal]
+
+
+def largest_triangle_three_buckets(points: Sequence[PricePoint], threshold: int) -> list[PricePoint]:
+    """Reduce ``points`` (ordered by time) to at most ``threshold`` points using LTTB.
+
+    The first and last points are always kept; every bucket in between contributes the
+    point forming the largest triangle with the previous pick and the next bucket's mean,
+    which preserves peaks and drops that naive striding would miss.
+    """
+
+    if threshold < 3 or threshold >= len(points):
+        return list(points)
+
+    xs = [point[0].timestamp() for point in points]
+    ys = [float(point[1]) for point in points]
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        span = next_end - next_start
+        mean_x = sum(xs[next_start:next_end]) / span
+        mean_y = sum(ys[next_start:next_end]) / span
+
+        anchor_x, anchor_y = xs[previous], ys[previous]
+        best_area = -1.0
+        best_index = start
+        for index in range(start, end):
+            area = abs(
+                (anchor_x - mean_x) * (ys[index] - anchor_y)
+                - (anchor_x - xs[index]) * (mean_y - anchor_y)
+            )
+            if area > best_area:
+                best_area = area
+                best_index = index
+
+        sampled.append(points[best_index])
+        previous = best_index
+
+    sampled.append(points[-1])
+    return sampled
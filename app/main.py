@@ -3,7 +3,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .core import metrics, profiling
 from .core.config import settings
+from .core.redis import close_redis
 from .routes.api import api_router
 
 
@@ -26,7 +28,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.profiling_enabled:
+        app.add_middleware(profiling.ProfilingMiddleware)
+    if settings.metrics_enabled:
+        # Added last so it wraps CORS too and times every request end to end.
+        app.add_middleware(metrics.MetricsMiddleware)
+        app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
+
     app.include_router(api_router, prefix=settings.api_v1_prefix)
+    app.add_event_handler("shutdown", close_redis)
 
     return app
 
@@ -1,5 +1,5 @@
 """ORM models used by the PricePulse service."""
 
-from .product import PriceHistory, Product
+from .product import PriceHistory, PriceHistoryDaily, Product
 
-__all__ = ["Product", "PriceHistory"]
+__all__ = ["Product", "PriceHistory", "PriceHistoryDaily"]
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Numeric, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, Numeric, String, Text, func, text
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.db.base import Base
 
@@ -15,6 +15,10 @@ class Product(Base):
     """Tracked product with metadata for price monitoring."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_next_check_at", "next_check_at", postgresql_where=text("is_active")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
@@ -22,11 +26,30 @@ class Product(Base):
     platform: Mapped[str] = mapped_column(String(length=50))
 
     target_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    # Set when an alert fires for reaching the target, cleared once the price is above it again.
+    target_alerted_at: Mapped[datetime | None] = mapped_column(nullable=True)
     last_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
     currency: Mapped[str | None] = mapped_column(String(length=8), nullable=True)
 
+    # Price summary maintained on every insert, so listings never scan the history.
+    lowest_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    highest_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    price_changed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    # Running totals of checks in the last 30 days; older checks are trimmed periodically.
+    recent_price_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0, server_default=text("0"))
+    recent_check_count: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    average_price_30d: Mapped[Decimal | None] = column_property(
+        func.round(recent_price_total / func.nullif(recent_check_count, 0), 2)
+    )
+
     is_active: Mapped[bool] = mapped_column(default=True)
     tracking_task_id: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    next_check_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    page_etag: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    page_last_modified: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
+    price_content_hash: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
+    price_confirmed_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -43,10 +66,41 @@ class PriceHistory(Base):
     """Historical record of product price snapshots."""
 
     __tablename__ = "price_history"
+    # Monthly range partitions on ``checked_at`` are managed by ``app.db.partitions``.
+    __table_args__ = {"postgresql_partition_by": "RANGE (checked_at)"}
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
-    checked_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    checked_at: Mapped[datetime] = mapped_column(primary_key=True, default=datetime.utcnow)
+    # A row is a run of identical prices: first seen at ``checked_at``, last at ``last_seen_at``.
+    last_seen_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    check_count: Mapped[int] = mapped_column(default=1)
 
     product: Mapped[Product] = relationship("Product", back_populates="price_history")
+
+
+Index(
+    "ix_price_history_product_checked",
+    PriceHistory.product_id,
+    PriceHistory.checked_at.desc(),
+    PriceHistory.id.desc(),
+    postgresql_include=["price", "last_seen_at", "check_count"],
+)
+
+
+class PriceHistoryDaily(Base):
+    """Daily price summary kept for history rolled up out of dropped partitions."""
+
+    __tablename__ = "price_history_daily"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    open_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    close_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    min_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    max_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    avg_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    samples: Mapped[int] = mapped_column()
+    first_checked_at: Mapped[datetime] = mapped_column()
+    last_checked_at: Mapped[datetime] = mapped_column()
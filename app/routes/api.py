@@ -2,12 +2,13 @@
 
 from fastapi import APIRouter
 
-from . import history, products
+from . import history, products, stats
 
 api_router = APIRouter()
 
 api_router.include_router(products.router)
 api_router.include_router(history.router)
+api_router.include_router(stats.router)
 
 
 @api_router.get("/health", tags=["health"])
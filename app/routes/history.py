@@ -1,26 +1,274 @@
 """Price history endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
-from app.db.session import get_async_session
-from app.models import Product
-from app.schemas import PriceHistoryRead
+from app.core import cache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import dump_json, dumps
+from app.db.session import (
+    get_async_session,
+    get_read_session,
+    open_read_session,
+    pin_reads_to_primary,
+    reads_from_primary,
+)
+from app.downsampling import largest_triangle_three_buckets
+from app.schemas import PriceHistoryBatch, PriceHistoryBucket, PriceHistoryPage, PricePoint
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+_history_page = TypeAdapter(PriceHistoryPage)
+_history_buckets = TypeAdapter(list[PriceHistoryBucket])
+_price_points = TypeAdapter(list[PricePoint])
+_BUCKET_FIELDS = tuple(PriceHistoryBucket.model_fields)
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """Convert a query timestamp with an offset to the naive UTC stored in the database."""
+
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _bucket_fields(row: Row) -> dict[str, Any]:
+    return {name: row._mapping[name] for name in _BUCKET_FIELDS}
+
+
+ExportFormat = Literal["ndjson", "csv"]
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+_EXPORT_FIELDS = [column.key for column in crud.HISTORY_EXPORT_COLUMNS]
+
+
+def _encode_ndjson(batch: Iterable[Row]) -> bytes:
+    return b"".join(dumps(dict(zip(_EXPORT_FIELDS, row))) + b"\n" for row in batch)
+
+
+def _encode_csv(batch: Iterable[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in batch
+    )
+    return buffer.getvalue().encode()
+
+
+async def _export_chunks(
+    format: ExportFormat,
+    *,
+    product_id: int | None,
+    since: datetime | None,
+    until: datetime | None,
+    primary: bool,
+) -> AsyncIterator[bytes]:
+    """Yield the export one fetched batch at a time."""
+
+    if format == "csv":
+        yield (",".join(_EXPORT_FIELDS) + "\r\n").encode()
+    encode = _encode_csv if format == "csv" else _encode_ndjson
+    # The stream outlives the request's dependencies, so it owns its session.
+    async with open_read_session(primary=primary) as session:
+        batches = crud.stream_price_history(
+            session,
+            product_id=product_id,
+            since=since,
+            until=until,
+            batch_size=settings.export_batch_size,
+        )
+        async for batch in batches:
+            yield encode(batch)
+
+
+def _export_response(
+    request: Request,
+    format: ExportFormat,
+    filename: str,
+    *,
+    product_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> StreamingResponse:
+    chunks = _export_chunks(
+        format,
+        product_id=product_id,
+        since=_naive_utc(since),
+        until=_naive_utc(until),
+        primary=reads_from_primary(request),
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
+def _expand_runs(runs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Expand runs (newest first) into one entry per check, spacing checks evenly across each run."""
+
+    expanded: list[dict[str, Any]] = []
+    for run in runs:
+        step = (run["last_seen_at"] - run["checked_at"]) / max(run["check_count"] - 1, 1)
+        for index in reversed(range(run["check_count"])):
+            checked_at = run["checked_at"] + step * index
+            expanded.append({**run, "checked_at": checked_at, "last_seen_at": checked_at, "check_count": 1})
+    return expanded
+
+
+@router.post("/history", status_code=status.HTTP_201_CREATED)
+async def ingest_price_history(
+    payload: PriceHistoryBatch,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+) -> dict[str, int]:
+    """Record a batch of externally sourced price observations in one transaction."""
+
+    observations = [(item.product_id, item.price, item.checked_at) for item in payload.items]
+    try:
+        recorded = await crud.insert_prices_bulk(session, observations)
+    except ValueError as exc:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+    pin_reads_to_primary(response)
+    return {"recorded": recorded}
+
 
-@router.get("/{product_id}/history", response_model=list[PriceHistoryRead])
+@router.get("/{product_id}/history", response_model=PriceHistoryPage)
 async def list_price_history(
+    request: Request,
     product_id: int,
-    session: AsyncSession = Depends(get_async_session),
-) -> list[PriceHistoryRead]:
-    """Return the stored price history for a product."""
+    since: datetime | None = Query(default=None, description="Only snapshots checked at or after this time."),
+    until: datetime | None = Query(default=None, description="Only snapshots checked before this time."),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page."),
+    expand: bool = Query(default=False, description="Return one entry per check instead of per price run."),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return the stored price history for a product, newest first.
+
+    Each entry is a run of unchanged prices; ``limit`` and the cursor count runs even when
+    ``expand`` reconstructs the individual checks inside them.
+    """
+
+    since, until = _naive_utc(since), _naive_utc(until)
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def build() -> bytes:
+        items = await crud.get_price_history(
+            session,
+            product_id,
+            since=since,
+            until=until,
+            limit=limit + 1,
+            before=before,
+        )
+        if items is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1]["checked_at"], items[-1]["id"])
+
+        if expand:
+            items = _expand_runs(items)
+        return dump_json({"items": items, "next_cursor": next_cursor}, _history_page)
+
+    return await cache.cached_response(request, cache.history_namespace(product_id), build)
+
+
+@router.get("/{product_id}/history/aggregate", response_model=list[PriceHistoryBucket])
+async def aggregate_price_history(
+    request: Request,
+    product_id: int,
+    bucket: Literal["1h", "1d", "1w"] = Query(default="1d", description="Bucket width."),
+    since: datetime | None = Query(default=None, description="Only snapshots checked at or after this time."),
+    until: datetime | None = Query(default=None, description="Only snapshots checked before this time."),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return open/close/min/max/avg prices per time bucket, computed in the database."""
+
+    since, until = _naive_utc(since), _naive_utc(until)
+
+    async def build() -> bytes:
+        buckets = await crud.aggregate_price_history(session, product_id, bucket, since=since, until=until)
+        if buckets is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        return dump_json([_bucket_fields(row) for row in buckets], _history_buckets)
+
+    return await cache.cached_response(request, cache.history_namespace(product_id), build)
+
+
+@router.get("/{product_id}/history/downsample", response_model=list[PricePoint])
+async def downsample_price_history(
+    request: Request,
+    product_id: int,
+    points: int = Query(default=500, ge=3, le=10000, description="Maximum number of points to return."),
+    since: datetime | None = Query(default=None, description="Only snapshots checked at or after this time."),
+    until: datetime | None = Query(default=None, description="Only snapshots checked before this time."),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return at most ``points`` snapshots chosen with LTTB to preserve the chart's shape."""
+
+    since, until = _naive_utc(since), _naive_utc(until)
+
+    async def build() -> bytes:
+        series = await crud.get_price_points(session, product_id, since=since, until=until)
+        if series is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+        sampled = largest_triangle_three_buckets(series, points)
+        return dump_json([{"checked_at": checked_at, "price": price} for checked_at, price in sampled], _price_points)
+
+    return await cache.cached_response(request, cache.history_namespace(product_id), build)
+
+
+@router.get("/history/export", response_class=StreamingResponse)
+async def export_all_price_history(
+    request: Request,
+    format: ExportFormat = Query(default="ndjson", description="ndjson or csv."),
+    since: datetime | None = Query(default=None, description="Only runs still current at or after this time."),
+    until: datetime | None = Query(default=None, description="Only runs starting before this time."),
+) -> StreamingResponse:
+    """Stream every product's stored price runs, ordered by product and then time."""
+
+    return _export_response(request, format, "price-history", since=since, until=until)
+
+
+@router.get("/{product_id}/history/export", response_class=StreamingResponse)
+async def export_price_history(
+    request: Request,
+    product_id: int,
+    format: ExportFormat = Query(default="ndjson", description="ndjson or csv."),
+    since: datetime | None = Query(default=None, description="Only runs still current at or after this time."),
+    until: datetime | None = Query(default=None, description="Only runs starting before this time."),
+    session: AsyncSession = Depends(get_read_session),
+) -> StreamingResponse:
+    """Stream a product's stored price runs oldest first without buffering them."""
 
-    product = await session.get(Product, product_id)
-    if product is None:
+    if not await crud.get_product_metadata(session, [product_id]):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
 
-    history = await crud.get_price_history(session, product_id)
-    return list(history)
+    return _export_response(
+        request,
+        format,
+        f"price-history-{product_id}",
+        product_id=product_id,
+        since=since,
+        until=until,
+    )
@@ -1,29 +1,63 @@
 """Product-related API endpoints."""
 
-from fastapi import APIRouter, Depends, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
-from app.db.session import get_async_session
-from app.schemas import ProductCreate, ProductRead
+from app.core import cache
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import dump_json
+from app.db.session import get_async_session, get_read_session, pin_reads_to_primary
+from app.schemas import ProductCreate, ProductPage, ProductRead
 from app.tasks.price_tracking import schedule_price_check
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+_product_page = TypeAdapter(ProductPage)
+
 
-@router.get("/", response_model=list[ProductRead])
+@router.get("/", response_model=ProductPage)
 async def list_products(
-    session: AsyncSession = Depends(get_async_session),
-) -> list[ProductRead]:
-    """List products currently being tracked."""
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page."),
+    include: Literal["history"] | None = Query(default=None, description="Embed recent price history."),
+    history_limit: int = Query(default=10, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """List tracked products newest first, one keyset page at a time."""
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def build() -> bytes:
+        products = [dict(row) for row in await crud.get_products(session, limit=limit + 1, after=after)]
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+
+        history = None
+        if include == "history":
+            history = await crud.get_recent_price_history(session, [product["id"] for product in products], history_limit)
+        for product in products:
+            product["price_history"] = None if history is None else [dict(entry) for entry in history.get(product["id"], [])]
+
+        return dump_json({"items": products, "next_cursor": next_cursor}, _product_page)
 
-    products = await crud.get_products(session)
-    return list(products)
+    return await cache.cached_response(request, cache.PRODUCTS_NAMESPACE, build)
 
 
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
 async def register_product(
     payload: ProductCreate,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
 ) -> ProductRead:
     """Register a product for price tracking and schedule the first scrape."""
@@ -33,6 +67,8 @@ async def register_product(
     product.tracking_task_id = task_id
 
     await session.commit()
+    await cache.invalidate_stale(session)
     await session.refresh(product)
+    pin_reads_to_primary(response)
 
     return product
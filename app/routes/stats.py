@@ -0,0 +1,47 @@
+"""Price statistics endpoints."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core import cache
+from app.core.serialization import dump_json
+from app.db.session import get_read_session
+from app.schemas import PriceStats, PriceStatsBatch
+
+router = APIRouter(tags=["stats"])
+
+_price_stats = TypeAdapter(PriceStats)
+_price_stats_list = TypeAdapter(list[PriceStats])
+
+
+@router.get("/products/{product_id}/stats", response_model=PriceStats)
+async def get_price_stats(
+    request: Request,
+    product_id: int,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return the product's current price against its 90-day range and 30-day distribution."""
+
+    async def build() -> bytes:
+        stats = await crud.get_price_stats(session, [product_id], now=datetime.utcnow())
+        if product_id not in stats:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        return dump_json(stats[product_id], _price_stats)
+
+    return await cache.cached_response(request, cache.history_namespace(product_id), build)
+
+
+@router.post("/stats/batch", response_model=list[PriceStats])
+async def get_price_stats_batch(
+    payload: PriceStatsBatch,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """Return statistics for many products in one query, in request order; unknown ids are skipped."""
+
+    stats = await crud.get_price_stats(session, payload.product_ids, now=datetime.utcnow())
+    items = [stats[product_id] for product_id in dict.fromkeys(payload.product_ids) if product_id in stats]
+    return Response(content=dump_json(items, _price_stats_list), media_type="application/json")
@@ -0,0 +1,66 @@
+"""Adaptive scrape interval calculation."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import timedelta
+from decimal import Decimal
+
+# Number of recent snapshots considered when estimating volatility.
+RECENT_PRICE_WINDOW = 20
+# Mean relative change per check at which a product keeps the base interval.
+REFERENCE_VOLATILITY = 0.01
+# Prices within this fraction above the target are checked progressively more often.
+TARGET_PROXIMITY = 0.05
+MIN_FACTOR = 0.25
+MAX_FACTOR = 4.0
+
+
+def _volatility_factor(recent_prices: Sequence[Decimal]) -> float:
+    """Scale the interval inversely to the mean relative change between consecutive checks."""
+
+    if len(recent_prices) < 2:
+        return 1.0
+
+    changes = [
+        abs(float(newer - older)) / float(older)
+        for newer, older in zip(recent_prices, recent_prices[1:])
+        if older
+    ]
+    if not changes:
+        return 1.0
+    volatility = sum(changes) / len(changes)
+    if volatility == 0:
+        return MAX_FACTOR
+    return min(max(REFERENCE_VOLATILITY / volatility, MIN_FACTOR), MAX_FACTOR)
+
+
+def _target_factor(current_price: Decimal | None, target_price: Decimal | None) -> float:
+    """Shorten the interval as the price approaches the target from above."""
+
+    if current_price is None or not target_price or target_price <= 0:
+        return 1.0
+
+    distance = float((current_price - target_price) / target_price)
+    if distance <= 0 or distance >= TARGET_PROXIMITY:
+        return 1.0
+    return max(distance / TARGET_PROXIMITY, MIN_FACTOR)
+
+
+def next_check_interval(
+    recent_prices: Sequence[Decimal],
+    target_price: Decimal | None,
+    *,
+    base: timedelta,
+    minimum: timedelta,
+    maximum: timedelta,
+) -> timedelta:
+    """Return how long to wait before checking a product again.
+
+    ``recent_prices`` is ordered newest first. Quiet products drift towards ``maximum``,
+    while volatile ones and those just above their target drift towards ``minimum``.
+    """
+
+    current_price = recent_prices[0] if recent_prices else None
+    factor = _volatility_factor(recent_prices) * _target_factor(current_price, target_price)
+    return min(max(base * factor, minimum), maximum)
@@ -1,12 +1,31 @@
 """Pydantic schemas for API payloads."""
 
-from .price_history import PriceHistoryCreate, PriceHistoryRead
-from .product import ProductCreate, ProductRead, ProductUpdate
+from .alert import PriceAlert
+from .price_history import (
+    PriceHistoryBatch,
+    PriceHistoryBucket,
+    PriceHistoryCreate,
+    PriceHistoryPage,
+    PriceHistoryRead,
+    PricePoint,
+    PriceStats,
+    PriceStatsBatch,
+)
+from .product import ProductCreate, ProductMetadata, ProductPage, ProductRead, ProductUpdate
 
 __all__ = [
+    "PriceAlert",
     "ProductCreate",
+    "ProductMetadata",
+    "ProductPage",
     "ProductRead",
     "ProductUpdate",
+    "PriceHistoryBatch",
+    "PriceHistoryBucket",
     "PriceHistoryCreate",
+    "PriceHistoryPage",
     "PriceHistoryRead",
+    "PricePoint",
+    "PriceStats",
+    "PriceStatsBatch",
 ]
@@ -0,0 +1,21 @@
+"""Pydantic models for target price alerts."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class PriceAlert(BaseModel):
+    """A product's price reaching its target after being above it."""
+
+    product_id: int
+    name: str | None = None
+    url: str
+    price: Decimal
+    target_price: Decimal
+    currency: str | None = None
+    triggered_at: datetime
+
+    class Config:
+        frozen = True
@@ -3,7 +3,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PriceHistoryBase(BaseModel):
@@ -15,10 +15,59 @@ class PriceHistoryCreate(PriceHistoryBase):
     product_id: int
 
 
+class PriceHistoryBatch(BaseModel):
+    items: list[PriceHistoryCreate] = Field(min_length=1, max_length=10_000)
+
+
 class PriceHistoryRead(PriceHistoryBase):
     id: int
     product_id: int
     checked_at: datetime
+    last_seen_at: datetime
+    check_count: int = 1
+
+    class Config:
+        from_attributes = True
+
+
+class PriceHistoryPage(BaseModel):
+    items: list[PriceHistoryRead]
+    next_cursor: str | None = None
+
+
+class PriceHistoryBucket(BaseModel):
+    bucket_start: datetime
+    open: Decimal
+    close: Decimal
+    min: Decimal
+    max: Decimal
+    avg: Decimal
+    samples: int
 
     class Config:
         from_attributes = True
+
+
+class PricePoint(BaseModel):
+    checked_at: datetime
+    price: Decimal
+
+
+class PriceStats(BaseModel):
+    """Price summary of one product; ``drop_from_median_30d_pct`` is positive when below the median."""
+
+    product_id: int
+    current_price: Decimal | None = None
+    low_90d: Decimal | None = None
+    high_90d: Decimal | None = None
+    p10_30d: Decimal | None = None
+    median_30d: Decimal | None = None
+    p90_30d: Decimal | None = None
+    drop_from_median_30d_pct: Decimal | None = None
+    volatility_30d: Decimal | None = None
+    samples_30d: int = 0
+    as_of: datetime
+
+
+class PriceStatsBatch(BaseModel):
+    product_ids: list[int] = Field(min_length=1, max_length=1000)
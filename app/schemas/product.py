@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, HttpUrl, field_validator, model_validator
+from sqlalchemy import inspect
 
 from app.schemas.price_history import PriceHistoryRead
 
@@ -39,9 +41,45 @@ class ProductRead(ProductBase):
     tracking_task_id: str | None = None
     is_active: bool = True
     last_price: Decimal | None = None
+    lowest_price: Decimal | None = None
+    highest_price: Decimal | None = None
+    average_price_30d: Decimal | None = None
+    price_changed_at: datetime | None = None
+    price_confirmed_at: datetime | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
     price_history: list[PriceHistoryRead] | None = None
 
     class Config:
         from_attributes = True
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_attributes(cls, data: Any) -> Any:
+        """Read only attributes the query loaded so serialisation never triggers lazy loads."""
+
+        state = inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "unloaded"):
+            return data
+        unloaded = state.unloaded
+        return {name: getattr(data, name) for name in cls.model_fields if name not in unloaded}
+
+
+class ProductMetadata(BaseModel):
+    """The fields of a product that scraping depends on, which only change on explicit edits."""
+
+    id: int
+    name: str | None = None
+    url: HttpUrl
+    platform: str
+    currency: str | None = None
+    target_price: Decimal | None = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class ProductPage(BaseModel):
+    items: list[ProductRead]
+    next_cursor: str | None = None
@@ -1,5 +1,17 @@
 """Scraper interfaces and implementations."""
 
-from .base import BaseScraper
+from .base import BaseScraper, PageValidators
+from .circuit import CircuitOpenError
+from .executor import ScrapeExecutor
+from .registry import get_scraper, register_scraper
+from .structured import StructuredDataScraper
 
-__all__ = ["BaseScraper"]
+__all__ = [
+    "BaseScraper",
+    "CircuitOpenError",
+    "PageValidators",
+    "ScrapeExecutor",
+    "StructuredDataScraper",
+    "get_scraper",
+    "register_scraper",
+]
@@ -3,9 +3,23 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Any
 
-from app.schemas.product import ProductRead
+import httpx
+
+from app.schemas.product import ProductMetadata
+
+from .http import get_http_client
+
+
+@dataclass(frozen=True)
+class PageValidators:
+    """What a previous scrape saw, used to skip unchanged pages."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
 
 
 class BaseScraper(ABC):
@@ -16,8 +30,32 @@ class BaseScraper(ABC):
     def __init__(self, platform: str) -> None:
         self.platform = platform
 
+    async def fetch_page(self, url: str, validators: PageValidators | None = None) -> httpx.Response:
+        """Fetch ``url`` through the shared connection pool, raising on HTTP errors.
+
+        When ``validators`` are given the request is conditional, and a ``304 Not Modified``
+        response is returned as-is for the caller to treat as unchanged.
+        """
+
+        headers = {}
+        if validators is not None:
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+
+        response = await get_http_client().get(url, headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return response
+        response.raise_for_status()
+        return response
+
     @abstractmethod
-    async def fetch_price(self, product: ProductRead) -> dict[str, Any]:
-        """Return the latest price information for the given product."""
+    async def fetch_price(self, product: ProductMetadata, validators: PageValidators | None = None) -> dict[str, Any]:
+        """Return the latest price information for the given product.
+
+        The result holds ``unchanged`` and the page's new ``validators``; unless
+        ``unchanged`` is true it also holds ``price`` and may hold ``currency``.
+        """
 
         raise NotImplementedError
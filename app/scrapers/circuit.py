@@ -0,0 +1,106 @@
+"""Per-platform circuit breaking for scrapers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.core.config import settings
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of scraping while a platform's circuit is open."""
+
+    def __init__(self, platform: str, retry_after: float) -> None:
+        super().__init__(f"Circuit open for platform {platform!r}; retry in {retry_after:.0f}s")
+        self.platform = platform
+        self.retry_after = retry_after
+
+    @property
+    def retry_at(self) -> datetime:
+        """Wall-clock time at which the platform will be tried again."""
+
+        return datetime.utcnow() + timedelta(seconds=self.retry_after)
+
+
+def is_platform_failure(exc: BaseException) -> bool:
+    """Return whether ``exc`` signals an unhealthy platform rather than a bad product page."""
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """Open after consecutive platform failures, then let a single trial through after a cooldown.
+
+    While the trial is in flight the circuit is half-open: other scrapes keep getting
+    :class:`CircuitOpenError` until the trial succeeds, closing it, or fails, re-opening it.
+    """
+
+    def __init__(self, platform: str, *, threshold: int | None = None, cooldown: float | None = None) -> None:
+        self.platform = platform
+        self.threshold = threshold or settings.scrape_breaker_failure_threshold
+        self.cooldown = cooldown or settings.scrape_breaker_cooldown_seconds
+        self.failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def half_open(self) -> bool:
+        """Whether the cooldown has passed but no trial has succeeded yet."""
+
+        return 0 < self._open_until <= time.monotonic()
+
+    def check(self) -> None:
+        """Raise :class:`CircuitOpenError` while the circuit is open or its trial is in flight."""
+
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(self.platform, remaining)
+        if self._trial_in_flight:
+            # The trial settles within one scrape timeout.
+            raise CircuitOpenError(self.platform, settings.scrape_timeout_seconds)
+
+    def allow(self) -> bool:
+        """Like :meth:`check`, but claim the trial when half-open and return whether it was claimed.
+
+        A claimed trial must be ended with :meth:`release` once the scrape finishes.
+        """
+
+        self.check()
+        if self.half_open:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """End the trial claimed by :meth:`allow`, whatever its outcome."""
+
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self._open_until = time.monotonic() + self.cooldown
+            # One more failure after the cooldown re-opens the circuit immediately.
+            self.failures = self.threshold - 1
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(platform: str) -> CircuitBreaker:
+    """Return the process-wide breaker for ``platform``."""
+
+    breaker = _breakers.get(platform)
+    if breaker is None:
+        breaker = _breakers[platform] = CircuitBreaker(platform)
+    return breaker
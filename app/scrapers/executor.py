@@ -0,0 +1,97 @@
+"""Bounded-concurrency execution of many scrapes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+from urllib.parse import urlsplit
+
+from app.core import metrics
+from app.core.config import settings
+from app.schemas.product import ProductMetadata
+
+from .base import PageValidators
+from .circuit import CircuitOpenError, get_circuit_breaker, is_platform_failure
+from .ratelimit import get_rate_limiter
+from .registry import get_scraper
+
+
+class ScrapeExecutor:
+    """Run ``fetch_price`` for many products in parallel within global, per-host and per-platform limits."""
+
+    def __init__(
+        self,
+        *,
+        concurrency: int | None = None,
+        per_host_limit: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self._slots = asyncio.Semaphore(concurrency or settings.scrape_concurrency)
+        self._per_host_limit = per_host_limit or settings.scrape_per_host_limit
+        self._timeout = timeout or settings.scrape_timeout_seconds
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def scrape(self, product: ProductMetadata, validators: PageValidators | None = None) -> dict[str, Any]:
+        """Scrape one product once its host, platform rate limit and executor allow it.
+
+        Raises :class:`~app.scrapers.circuit.CircuitOpenError` without scraping while the
+        product's platform is failing.
+        """
+
+        try:
+            result = await self._scrape(product, validators)
+        except CircuitOpenError:
+            metrics.SCRAPES.labels(product.platform, "circuit_open").inc()
+            raise
+        except Exception:
+            metrics.SCRAPES.labels(product.platform, "failed").inc()
+            raise
+        metrics.SCRAPES.labels(product.platform, "unchanged" if result.get("unchanged") else "ok").inc()
+        return result
+
+    async def _scrape(self, product: ProductMetadata, validators: PageValidators | None) -> dict[str, Any]:
+        breaker = get_circuit_breaker(product.platform)
+        breaker.check()
+
+        host = urlsplit(str(product.url)).hostname or ""
+        host_slots = self._host_slots.setdefault(host, asyncio.Semaphore(self._per_host_limit))
+        # Wait on the host and the platform's token bucket before taking a global slot, so a
+        # busy or throttled platform never starves healthy ones of executor capacity.
+        async with host_slots:
+            breaker.check()
+            await get_rate_limiter().acquire(product.platform)
+            async with self._slots:
+                # After a cooldown only one scrape per platform gets through as the trial.
+                trial = breaker.allow()
+                scraper = get_scraper(product.platform)
+                started = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(scraper.fetch_price(product, validators), self._timeout)
+                except Exception as exc:
+                    if is_platform_failure(exc):
+                        breaker.record_failure()
+                    raise
+                finally:
+                    if trial:
+                        breaker.release()
+                    metrics.SCRAPE_DURATION.labels(product.platform).observe(time.perf_counter() - started)
+        breaker.record_success()
+        return result
+
+    async def run(
+        self,
+        products: Sequence[ProductMetadata],
+        validators: Mapping[int, PageValidators] | None = None,
+    ) -> list[dict[str, Any] | BaseException]:
+        """Scrape all ``products``, returning results or exceptions in input order.
+
+        ``validators`` maps product ids to what their previous scrape saw.
+        """
+
+        validators = validators or {}
+        return await asyncio.gather(
+            *(self.scrape(product, validators.get(product.id)) for product in products),
+            return_exceptions=True,
+        )
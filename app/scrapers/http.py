@@ -0,0 +1,40 @@
+"""Shared keep-alive HTTP client used by all scrapers in a process."""
+
+from __future__ import annotations
+
+import httpx
+
+from app.core.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it on first use.
+
+    Connections are pooled and kept alive across scrapes; HTTP/2 is negotiated
+    with hosts that support it and HTTP/1.1 is used otherwise.
+    """
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=httpx.Timeout(settings.scrape_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.scrape_concurrency,
+                max_keepalive_connections=settings.scrape_concurrency,
+            ),
+            headers={"User-Agent": settings.scrape_user_agent},
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release its pooled connections."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,113 @@
+"""Per-platform token-bucket rate limiting shared across workers through Redis."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Reserve one token and return how long the caller must wait for it. Tokens may go
+# negative, which queues callers fairly without retries. Uses the Redis clock so
+# workers on different hosts agree on elapsed time.
+_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+# After a Redis failure, use local buckets for this long before trying Redis again.
+REDIS_RETRY_SECONDS = 30.0
+
+
+class LocalTokenBucket:
+    """In-process token bucket with the same reservation semantics as the Redis script."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - 1
+        self._updated = now
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class PlatformRateLimiter:
+    """Token buckets keyed by platform, stored in Redis with a per-process fallback."""
+
+    def __init__(self, *, shared: bool | None = None) -> None:
+        self.shared = settings.scrape_rate_limit_shared if shared is None else shared
+        self._local: dict[str, LocalTokenBucket] = {}
+        self._redis_retry_at = 0.0
+
+    def rate_for(self, platform: str) -> float:
+        """Return the permitted requests per second for ``platform``."""
+
+        return settings.scrape_platform_rate_limits.get(platform, settings.scrape_rate_limit_per_second)
+
+    async def _reserve_shared(self, platform: str, rate: float) -> float | None:
+        """Reserve a token in Redis, or return ``None`` when Redis is unavailable."""
+
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            wait = await get_redis().eval(
+                _RESERVE_SCRIPT,
+                1,
+                f"pricepulse:ratelimit:{platform}",
+                rate,
+                settings.scrape_rate_limit_burst,
+            )
+        except (RedisError, OSError) as exc:
+            logger.warning("Redis rate limiter unavailable, using local buckets: %s", exc)
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+        return float(wait)
+
+    async def acquire(self, platform: str) -> None:
+        """Wait until ``platform`` may be sent another request."""
+
+        rate = self.rate_for(platform)
+        wait = await self._reserve_shared(platform, rate) if self.shared else None
+        if wait is None:
+            bucket = self._local.get(platform)
+            if bucket is None or bucket.rate != rate:
+                bucket = self._local[platform] = LocalTokenBucket(rate, settings.scrape_rate_limit_burst)
+            wait = bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiter: PlatformRateLimiter | None = None
+
+
+def get_rate_limiter() -> PlatformRateLimiter:
+    """Return the process-wide rate limiter so local buckets persist between tasks."""
+
+    global _limiter
+    if _limiter is None:
+        _limiter = PlatformRateLimiter()
+    return _limiter
@@ -0,0 +1,22 @@
+"""Lookup of scrapers by product platform."""
+
+from __future__ import annotations
+
+from .base import BaseScraper
+from .structured import StructuredDataScraper
+
+_scrapers: dict[str, BaseScraper] = {}
+_default = StructuredDataScraper(platform="generic")
+
+
+def register_scraper(scraper: BaseScraper) -> BaseScraper:
+    """Register ``scraper`` for its platform, replacing any previous registration."""
+
+    _scrapers[scraper.platform.lower()] = scraper
+    return scraper
+
+
+def get_scraper(platform: str) -> BaseScraper:
+    """Return the scraper for ``platform``, falling back to structured-data extraction."""
+
+    return _scrapers.get(platform.lower(), _default)
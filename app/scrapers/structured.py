@@ -0,0 +1,108 @@
+"""Scraper that reads prices from a page's structured product metadata."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import httpx
+
+from app.schemas.product import ProductMetadata
+
+from .base import BaseScraper, PageValidators
+
+_META_TAG = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"([\w:-]+)\s*=\s*[\"']([^\"']*)[\"']")
+_JSON_LD = re.compile(
+    r"<script[^>]+type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+PRICE_KEYS = {"price", "product:price:amount", "og:price:amount"}
+CURRENCY_KEYS = {"pricecurrency", "product:price:currency", "og:price:currency"}
+
+
+def parse_price(value: str) -> Decimal:
+    """Convert a displayed price such as ``"$1,299.00"`` to ``Decimal``."""
+
+    try:
+        return Decimal(re.sub(r"[^\d.]", "", value))
+    except InvalidOperation as exc:
+        raise ValueError(f"Unparseable price {value!r}") from exc
+
+
+def _find_offer(node: Any) -> dict[str, Any] | None:
+    """Return the first JSON-LD object carrying a ``price`` key."""
+
+    if isinstance(node, dict):
+        if "price" in node:
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+
+    for child in children:
+        offer = _find_offer(child)
+        if offer is not None:
+            return offer
+    return None
+
+
+def extract_price_region(html: str) -> tuple[str, str | None]:
+    """Return the raw price and currency text from meta tags or JSON-LD, raising ``ValueError`` if absent."""
+
+    price: str | None = None
+    currency: str | None = None
+    for tag in _META_TAG.findall(html):
+        attributes = {key.lower(): value for key, value in _ATTRIBUTE.findall(tag)}
+        name = (attributes.get("itemprop") or attributes.get("property") or attributes.get("name") or "").lower()
+        if name in PRICE_KEYS and price is None:
+            price = attributes.get("content")
+        elif name in CURRENCY_KEYS and currency is None:
+            currency = attributes.get("content")
+
+    if price is None:
+        for block in _JSON_LD.findall(html):
+            try:
+                offer = _find_offer(json.loads(block))
+            except json.JSONDecodeError:
+                continue
+            if offer is not None:
+                price = str(offer["price"])
+                currency = currency or offer.get("priceCurrency")
+                break
+
+    if not price:
+        raise ValueError("No price found in page metadata")
+    return price, currency
+
+
+def extract_price(html: str) -> dict[str, Any]:
+    """Extract the parsed price and currency from a product page."""
+
+    price, currency = extract_price_region(html)
+    return {"price": parse_price(price), "currency": currency}
+
+
+class StructuredDataScraper(BaseScraper):
+    """Fallback scraper for any platform exposing schema.org or Open Graph price metadata."""
+
+    async def fetch_price(self, product: ProductMetadata, validators: PageValidators | None = None) -> dict[str, Any]:
+        response = await self.fetch_page(str(product.url), validators)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return {"unchanged": True, "validators": validators}
+
+        price, currency = extract_price_region(response.text)
+        fresh = PageValidators(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=hashlib.sha256(f"{price}\x00{currency}".encode()).hexdigest(),
+        )
+        if validators is not None and fresh.content_hash == validators.content_hash:
+            return {"unchanged": True, "validators": fresh}
+        return {"unchanged": False, "validators": fresh, "price": parse_price(price), "currency": currency}
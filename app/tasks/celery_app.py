@@ -4,6 +4,8 @@ from celery import Celery
 
 from app.core.config import settings
 
+from . import instrumentation  # noqa: F401  (connects the task metrics signals)
+
 
 BROKER_URL = settings.celery_broker_url or settings.redis_url
 RESULT_BACKEND = settings.celery_result_backend or settings.redis_url
@@ -16,7 +18,7 @@ def create_celery_app() -> Celery:
         "pricepulse",
         broker=BROKER_URL,
         backend=RESULT_BACKEND,
-        include=["app.tasks.price_tracking"],
+        include=["app.tasks.price_tracking", "app.tasks.maintenance"],
     )
 
     app.conf.task_routes = {"app.tasks.price_tracking.*": {"queue": "price_tracking"}}
@@ -26,8 +28,20 @@ def create_celery_app() -> Celery:
         beat_schedule={
             "scheduled-product-scan": {
                 "task": "app.tasks.price_tracking.enqueue_recurring_scrape",
-                "schedule": settings.scrape_interval_minutes * 60,
-            }
+                "schedule": settings.scheduler_tick_seconds,
+            },
+            "price-history-partitions": {
+                "task": "app.tasks.maintenance.create_price_history_partitions",
+                "schedule": settings.price_history_maintenance_seconds,
+            },
+            "price-history-retention": {
+                "task": "app.tasks.maintenance.apply_price_history_retention",
+                "schedule": settings.price_history_maintenance_seconds,
+            },
+            "recent-price-totals": {
+                "task": "app.tasks.maintenance.refresh_recent_price_totals",
+                "schedule": settings.price_history_maintenance_seconds,
+            },
         },
     )
 
@@ -0,0 +1,106 @@
+"""Celery signal handlers feeding task runtime and queue lag metrics and serving them.
+
+Task and scrape metrics are recorded in the worker's pool processes, which the API's
+``/metrics`` never sees unless every process shares ``PROMETHEUS_MULTIPROC_DIR``. When
+``settings.metrics_worker_port`` is set, workers serve their own metrics on it: in
+multiprocess mode the main worker process reports all pool processes there; otherwise
+the main process uses that port and pool process ``n`` the port ``n + 1`` above it. A
+port that cannot be bound, e.g. taken by another worker on the host, is logged and
+skipped without failing the worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from billiard.process import current_process
+from celery import Task
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from prometheus_client import multiprocess, start_http_server
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+_started: dict[str, float] = {}
+
+
+def _scheduled_at(task: Task) -> float | None:
+    enqueued_at = getattr(task.request, ENQUEUED_AT_HEADER, None)
+    if enqueued_at is None:
+        return None
+    eta = task.request.eta
+    if eta:
+        # A countdown is a deliberate delay, not lag; measure from when the task became due.
+        due = datetime.fromisoformat(eta)
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        return max(float(enqueued_at), due.timestamp())
+    return float(enqueued_at)
+
+
+def _stamp_enqueued_at(headers: dict[str, Any] | None = None, **_: Any) -> None:
+    if headers is not None:
+        headers[ENQUEUED_AT_HEADER] = time.time()
+
+
+def _record_start(task_id: str, task: Task, **_: Any) -> None:
+    _started[task_id] = time.perf_counter()
+    scheduled_at = _scheduled_at(task)
+    if scheduled_at is not None:
+        metrics.TASK_QUEUE_LAG.labels(task.name).observe(max(time.time() - scheduled_at, 0.0))
+
+
+def _record_finish(task_id: str, task: Task, state: str | None = None, **_: Any) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None:
+        metrics.TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+def _serve(port: int) -> None:
+    try:
+        start_http_server(port, registry=metrics.metrics_registry())
+    except OSError as exc:
+        logger.warning("Cannot serve worker metrics on port %s: %s", port, exc)
+        return
+    logger.info("Serving worker metrics on port %s", port)
+
+
+def _serve_worker_metrics(**_: Any) -> None:
+    _serve(settings.metrics_worker_port)
+
+
+def _serve_pool_process_metrics(**_: Any) -> None:
+    index = getattr(current_process(), "index", None)
+    if not metrics.multiprocess_mode() and index is not None:
+        _serve(settings.metrics_worker_port + 1 + index)
+
+
+def _mark_pool_process_dead(**_: Any) -> None:
+    # Drops the exiting process's live gauges from the shared directory.
+    if metrics.multiprocess_mode():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+if settings.metrics_enabled:
+    before_task_publish.connect(_stamp_enqueued_at, weak=False)
+    task_prerun.connect(_record_start, weak=False)
+    task_postrun.connect(_record_finish, weak=False)
+    worker_process_shutdown.connect(_mark_pool_process_dead, weak=False)
+    if settings.metrics_worker_port is not None:
+        worker_init.connect(_serve_worker_metrics, weak=False)
+        worker_process_init.connect(_serve_pool_process_metrics, weak=False)
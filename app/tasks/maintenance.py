@@ -0,0 +1,87 @@
+"""Celery tasks that keep the price history table and its summaries maintained."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from app import crud
+from app.core import cache
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import SessionLocal
+
+from .celery_app import celery_app
+from .runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+
+async def _create_price_history_partitions_async() -> list[str]:
+    async with SessionLocal() as session:
+        return await partitions.ensure_partitions(
+            session,
+            now=datetime.utcnow(),
+            months_ahead=settings.price_history_partitions_ahead,
+        )
+
+
+@celery_app.task(name="app.tasks.maintenance.create_price_history_partitions")
+def create_price_history_partitions() -> list[str]:
+    """Periodic task creating monthly history partitions before they are needed."""
+
+    try:
+        created = run_async(_create_price_history_partitions_async())
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.exception("Failed to create price history partitions")
+        raise exc
+
+    if created:
+        logger.info("Created price history partitions %s", ", ".join(created))
+    return created
+
+
+async def _apply_price_history_retention_async(retention_days: int) -> list[str]:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    async with SessionLocal() as session:
+        return await partitions.drop_expired_partitions(session, cutoff=cutoff)
+
+
+@celery_app.task(name="app.tasks.maintenance.apply_price_history_retention")
+def apply_price_history_retention() -> list[str]:
+    """Periodic task rolling history older than the retention window into daily summaries."""
+
+    if settings.price_history_retention_days is None:
+        return []
+
+    try:
+        dropped = run_async(_apply_price_history_retention_async(settings.price_history_retention_days))
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.exception("Failed to apply price history retention")
+        raise exc
+
+    if dropped:
+        logger.info("Rolled up and dropped price history partitions %s", ", ".join(dropped))
+    return dropped
+
+
+async def _refresh_recent_price_totals_async() -> int:
+    async with SessionLocal() as session:
+        updated = await crud.refresh_recent_price_totals(session, now=datetime.utcnow())
+        await session.commit()
+        await cache.invalidate_stale(session)
+        return updated
+
+
+@celery_app.task(name="app.tasks.maintenance.refresh_recent_price_totals")
+def refresh_recent_price_totals() -> int:
+    """Periodic task trimming checks older than 30 days from each product's running average."""
+
+    try:
+        updated = run_async(_refresh_recent_price_totals_async())
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.exception("Failed to refresh recent price totals")
+        raise exc
+
+    logger.info("Refreshed recent price totals of %s products", updated)
+    return updated
@@ -2,20 +2,64 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
-from decimal import Decimal
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 from typing import Any
 
-from app import crud
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import alerts, crud
+from app.core import cache
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models import Product
+from app.schemas import ProductMetadata
+from app.scrapers import CircuitOpenError, PageValidators, ScrapeExecutor
+from app.scheduling import RECENT_PRICE_WINDOW, next_check_interval
 
 from .celery_app import celery_app
+from .runtime import run_async
 
 logger = logging.getLogger(__name__)
 
 
+def _page_validators(product: Product | Row) -> PageValidators:
+    """Return what the previous scrape of ``product`` saw."""
+
+    return PageValidators(
+        etag=product.page_etag,
+        last_modified=product.page_last_modified,
+        content_hash=product.price_content_hash,
+    )
+
+
+def _validator_values(validators: PageValidators) -> crud.PageValidatorValues:
+    return validators.etag, validators.last_modified, validators.content_hash
+
+
+async def _reschedule(session: AsyncSession, products: Sequence[Product | Row]) -> None:
+    """Plan each product's next check from its recent prices and distance to target."""
+
+    recent = await crud.get_recent_prices(session, [product.id for product in products], RECENT_PRICE_WINDOW)
+    now = datetime.utcnow()
+    schedule = {
+        product.id: now
+        + next_check_interval(
+            recent.get(product.id, []),
+            product.target_price,
+            base=timedelta(minutes=settings.scrape_interval_minutes),
+            minimum=timedelta(minutes=settings.scrape_min_interval_minutes),
+            maximum=timedelta(minutes=settings.scrape_max_interval_minutes),
+        )
+        for product in products
+    }
+    await crud.set_next_check_times(session, schedule)
+
+
 async def _track_product_price_async(product_id: int) -> dict[str, Any]:
     """Fetch the latest price for a product and persist it."""
 
@@ -25,9 +69,33 @@ async def _track_product_price_async(product_id: int) -> dict[str, Any]:
             logger.warning("Product %s not found when tracking price", product_id)
             return {"status": "not_found", "product_id": product_id}
 
-        # Placeholder pricing logic until scrapers are implemented.
-        price = product.last_price or product.target_price or Decimal("0")
-        entry = await crud.insert_price(session, product_id, price, commit=True)
+        try:
+            scraped = await ScrapeExecutor().scrape(ProductMetadata.model_validate(product), _page_validators(product))
+        except CircuitOpenError as exc:
+            await crud.set_next_check_times(session, {product_id: exc.retry_at})
+            await session.commit()
+            logger.info("Deferred product %s: %s", product_id, exc)
+            return {"status": "deferred", "product_id": product_id}
+
+        await crud.record_page_validators(
+            session,
+            {product_id: _validator_values(scraped["validators"])},
+            confirmed_at=datetime.utcnow(),
+        )
+        if scraped["unchanged"]:
+            if settings.price_history_change_only and product.last_price is not None:
+                await crud.insert_price(session, product_id, product.last_price, commit=False)
+            await _reschedule(session, [product])
+            await session.commit()
+            await cache.invalidate_stale(session)
+            await alerts.dispatch_pending(session)
+            return {"status": "unchanged", "product_id": product_id}
+
+        entry = await crud.insert_price(session, product_id, scraped["price"], commit=False)
+        await _reschedule(session, [product])
+        await session.commit()
+        await cache.invalidate_stale(session)
+        await alerts.dispatch_pending(session)
 
     logger.info(
         "Recorded price %.2f for product %s", entry.price, product_id
@@ -45,37 +113,138 @@ def track_product_price(product_id: int) -> dict[str, Any]:
     """Celery task entrypoint for recording the latest product price."""
 
     try:
-        return asyncio.run(_track_product_price_async(product_id))
+        return run_async(_track_product_price_async(product_id))
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("Price tracking failed for product %s", product_id)
         raise exc
 
 
-async def _enqueue_recurring_scrape_async() -> int:
-    """Queue price tracking tasks for all active products."""
+async def _track_products_batch_async(product_ids: list[int]) -> dict[str, Any]:
+    """Scrape a chunk of products concurrently and persist their prices in one transaction."""
 
     async with SessionLocal() as session:
-        products = await crud.get_products(session)
-        product_ids = [product.id for product in products]
+        # What to scrape comes from the metadata cache; only the state each scrape
+        # updates is read from the database, without building ORM entities.
+        metadata = await crud.get_product_metadata(session, product_ids)
+        products = await crud.get_scrape_states(session, list(metadata))
+        started = time.perf_counter()
+        results = await ScrapeExecutor().run(
+            [metadata[product.id] for product in products],
+            {product.id: _page_validators(product) for product in products},
+        )
+        elapsed = time.perf_counter() - started
+
+        observations: list[crud.PriceObservation] = []
+        seen: dict[int, crud.PageValidatorValues] = {}
+        unchanged = 0
+        failed: list[int] = []
+        deferred: dict[int, datetime] = {}
+        for product, result in zip(products, results):
+            if isinstance(result, CircuitOpenError):
+                deferred[product.id] = result.retry_at
+                continue
+            if isinstance(result, BaseException):
+                logger.warning("Price fetch failed for product %s: %r", product.id, result)
+                failed.append(product.id)
+                continue
+            seen[product.id] = _validator_values(result["validators"])
+            if result["unchanged"]:
+                unchanged += 1
+                # Runs record how long a price held, so confirmations extend the current run.
+                if settings.price_history_change_only and product.last_price is not None:
+                    observations.append((product.id, product.last_price, None))
+                continue
+            observations.append((product.id, result["price"], None))
+
+        # Unchanged pages never add history rows; at most they stretch the current run.
+        recorded = await crud.insert_prices_bulk(session, observations, commit=False)
+        await crud.record_page_validators(session, seen, confirmed_at=datetime.utcnow())
+        await _reschedule(session, [product for product in products if product.id in seen])
+        # Products on a platform whose circuit is open go back on the queue for when it closes.
+        await crud.set_next_check_times(session, deferred)
+        await session.commit()
+        await cache.invalidate_stale(session)
+        await alerts.dispatch_pending(session)
 
-    for product_id in product_ids:
-        track_product_price.delay(product_id)
+    logger.info(
+        "Scraped %s products in %.2fs (%.1f/s)",
+        len(products),
+        elapsed,
+        len(products) / elapsed if elapsed else 0.0,
+    )
+    found = {product.id for product in products}
+    return {
+        "status": "recorded",
+        "recorded": recorded,
+        "unchanged": unchanged,
+        "failed": failed,
+        "deferred": list(deferred),
+        "not_found": [product_id for product_id in product_ids if product_id not in found],
+    }
+
+
+@celery_app.task(name="app.tasks.price_tracking.track_products_batch")
+def track_products_batch(product_ids: list[int]) -> dict[str, Any]:
+    """Celery task entrypoint for recording prices for a chunk of products."""
 
-    return len(product_ids)
+    try:
+        result = run_async(_track_products_batch_async(product_ids))
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.exception("Batch price tracking failed for %s products", len(product_ids))
+        raise exc
+
+    logger.info("Recorded %s prices in batch of %s products", result["recorded"], len(product_ids))
+    return result
+
+
+async def _enqueue_recurring_scrape_async() -> dict[str, int]:
+    """Lease products whose next check is due and queue them in per-platform batches.
+
+    Due products are claimed most overdue first, one batch per transaction. Each claim
+    commits before its batches are queued, so a failure later in the tick never leaves a
+    queued product unleased, and scrape tasks never wait on the claim's row locks. Each
+    lease lasts one base interval, after which a product whose check never completed
+    becomes due again.
+    """
+
+    now = datetime.utcnow()
+    lease_until = now + timedelta(minutes=settings.scrape_interval_minutes)
+    queued = 0
+    batches = 0
+    async with SessionLocal() as session:
+        while True:
+            rows = await crud.claim_due_products(
+                session,
+                now=now,
+                lease_until=lease_until,
+                limit=settings.scrape_batch_size,
+            )
+            await session.commit()
+            by_platform: dict[str, list[int]] = defaultdict(list)
+            for row in rows:
+                by_platform[row.platform].append(row.id)
+            for product_ids in by_platform.values():
+                track_products_batch.delay(product_ids)
+                batches += 1
+            queued += len(rows)
+            if len(rows) < settings.scrape_batch_size:
+                break
+
+    return {"queued": queued, "batches": batches}
 
 
 @celery_app.task(name="app.tasks.price_tracking.enqueue_recurring_scrape")
 def enqueue_recurring_scrape() -> dict[str, int]:
-    """Periodic task executed by Celery beat to schedule scrapes."""
+    """Periodic task executed by Celery beat to dispatch due scrapes."""
 
     try:
-        queued = asyncio.run(_enqueue_recurring_scrape_async())
+        result = run_async(_enqueue_recurring_scrape_async())
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("Failed to enqueue recurring price checks")
         raise exc
 
-    logger.info("Queued %s price tracking tasks", queued)
-    return {"queued": queued}
+    logger.info("Queued %s products in %s batch tasks", result["queued"], result["batches"])
+    return result
 
 
 def schedule_price_check(product_id: int) -> str:
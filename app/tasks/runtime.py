@@ -0,0 +1,71 @@
+"""Per-worker asyncio runtime shared by Celery tasks."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.redis import close_redis
+from app.db.session import SessionLocal, build_async_engine
+from app.scrapers.http import close_http_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_engine: AsyncEngine | None = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process event loop, creating it on first use (e.g. solo pool or scripts)."""
+
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` to completion on the long-lived loop owned by this process.
+
+    Unlike ``asyncio.run`` the loop survives between tasks, so pooled asyncpg
+    connections stay attached to the loop that opened them and are reused.
+    """
+
+    return _get_loop().run_until_complete(coro)
+
+
+@worker_process_init.connect
+def init_worker_process(**_: Any) -> None:
+    """Give each forked worker its own loop and engine instead of the parent's pool."""
+
+    global _engine, _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _engine = build_async_engine()
+    SessionLocal.configure(bind=_engine)
+    logger.debug("Initialised worker event loop and database engine")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**_: Any) -> None:
+    """Dispose of the worker's connection pools and close its loop."""
+
+    global _engine, _loop
+    if _loop is None or _loop.is_closed():
+        return
+    _loop.run_until_complete(close_http_client())
+    _loop.run_until_complete(close_redis())
+    if _engine is not None:
+        _loop.run_until_complete(_engine.dispose())
+        _engine = None
+    _loop.run_until_complete(_loop.shutdown_asyncgens())
+    _loop.close()
+    _loop = None
@@ -0,0 +1,5 @@
+"""Reproducible performance benchmarks for the CRUD layer, the HTTP API and the task pipeline.
+
+Run ``python -m benchmarks run`` against a scratch database and compare two result files
+with ``python -m benchmarks compare``. See ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,175 @@
+"""Run the benchmark suites or compare two result files.
+
+Usage::
+
+    python -m benchmarks run --reset --products 1000 --history 200 --output before.json
+    python -m benchmarks run --reset --products 1000 --history 200 --output after.json
+    python -m benchmarks compare before.json after.json
+
+The tasks suite records prices and reschedules products, so every run that includes it
+reseeds the same data from ``--seed``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.alerts import MemorySink, set_sink
+from app.core.config import settings
+from app.core.redis import close_redis
+from app.db.session import async_engine
+
+from . import api, crud, data, listing, tasks
+from .timing import Result
+
+SUITES = ("crud", "listing", "api", "tasks")
+
+
+def _commit() -> str | None:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+async def _prepare(args: argparse.Namespace) -> data.Dataset:
+    try:
+        if args.no_seed:
+            return await data.load()
+        return await data.seed(args.products, args.history, seed=args.seed, reset=args.reset)
+    finally:
+        await async_engine.dispose()
+
+
+async def _run_async_suites(args: argparse.Namespace, dataset: data.Dataset) -> list[Result]:
+    results = []
+    try:
+        if "crud" in args.suite:
+            results += await crud.run(dataset, rounds=args.rounds, seed=args.seed)
+        if "listing" in args.suite:
+            results += await listing.run(dataset, rounds=args.rounds)
+        if "api" in args.suite:
+            results += await api.run(dataset, requests=args.requests, concurrency=args.concurrency, seed=args.seed)
+    finally:
+        await close_redis()
+        await async_engine.dispose()
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    # Measure the database and serialisation paths, not Redis hits.
+    settings.cache_enabled = args.cache
+    # Target crossings caused by benchmark prices must not reach the configured webhook.
+    set_sink(MemorySink())
+    dataset = asyncio.run(_prepare(args))
+    print(f"Benchmarking {len(dataset.product_ids)} products with {dataset.history_per_product} history runs each")
+
+    results = asyncio.run(_run_async_suites(args, dataset))
+    for result in results:
+        print(result)
+    if "tasks" in args.suite:
+        # Eager tasks run on the worker runtime's own loop, outside asyncio.run.
+        for result in tasks.run(dataset, rounds=args.task_rounds, seed=args.seed):
+            print(result)
+            results.append(result)
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parameters": {
+            "products": len(dataset.product_ids),
+            "history_per_product": dataset.history_per_product,
+            "rounds": args.rounds,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "task_rounds": args.task_rounds,
+            "seed": args.seed,
+            "cache": args.cache,
+        },
+        "results": [result.summary() for result in results],
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Wrote {args.output}")
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *, threshold: float) -> list[str]:
+    """Print p50/p95 and throughput changes per benchmark; return the names that regressed."""
+
+    before = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<40} {'p50':>10} {'p95':>10} {'ops/s':>10}")
+    for result in current["results"]:
+        old = before.get(result["name"])
+        if old is None:
+            print(f"{result['name']:<40} {'new':>10}")
+            continue
+        changes = [
+            (result[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            for key in ("p50_ms", "p95_ms", "ops_per_s")
+        ]
+        # Slower latency or lower throughput beyond the threshold is a regression.
+        regressed = changes[0] > threshold or changes[2] < -threshold
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{result['name']:<40} {changes[0]:>+9.1f}% {changes[1]:>+9.1f}% {changes[2]:>+9.1f}%{flag}")
+        if regressed:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="seed a scratch database and run the benchmark suites")
+    runner.add_argument("--products", type=int, default=1000, help="products to seed (default: %(default)s)")
+    runner.add_argument("--history", type=int, default=200, help="history runs per product (default: %(default)s)")
+    runner.add_argument("--seed", type=int, default=0, help="random seed for data and workloads (default: %(default)s)")
+    runner.add_argument("--reset", action="store_true", help="truncate products and history before seeding")
+    runner.add_argument("--no-seed", action="store_true", help="benchmark the data already in the database")
+    runner.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES))
+    runner.add_argument("--rounds", type=int, default=50, help="timed calls per CRUD benchmark (default: %(default)s)")
+    runner.add_argument("--requests", type=int, default=1000, help="requests per API scenario (default: %(default)s)")
+    runner.add_argument("--concurrency", type=int, default=10, help="concurrent API clients (default: %(default)s)")
+    runner.add_argument("--task-rounds", type=int, default=3, help="full scrape cycles timed (default: %(default)s)")
+    runner.add_argument("--cache", action="store_true", help="keep the Redis response cache enabled")
+    runner.add_argument("--output", type=Path, help="write results as JSON for later comparison")
+
+    comparer = commands.add_parser("compare", help="compare two result files; exits 1 on regressions")
+    comparer.add_argument("baseline", type=Path)
+    comparer.add_argument("current", type=Path)
+    comparer.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="percent change in p50 or ops/s counted as a regression (default: %(default)s)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.no_seed and "tasks" in args.suite:
+        parser.error("the tasks suite changes the seeded data; reseed with --reset, or leave it out with --suite")
+    if args.command == "run":
+        run(args)
+        return
+    regressions = compare(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.current.read_text()),
+        threshold=args.threshold,
+    )
+    if regressions:
+        print(f"{len(regressions)} regressions over {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""In-process load test of the FastAPI app through httpx's ASGI transport."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.main import app
+
+from .data import Dataset
+from .timing import Result
+
+LARGE_HISTORY_LIMIT = 20
+
+
+async def load(client: httpx.AsyncClient, name: str, paths: list[str], *, requests: int, concurrency: int) -> Result:
+    """Send ``requests`` GETs cycling through ``paths`` from ``concurrency`` concurrent clients."""
+
+    result = Result(name)
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for index in queue:
+            started = time.perf_counter()
+            response = await client.get(paths[index % len(paths)])
+            # Drain streaming responses, so their latency covers the whole body.
+            await response.aread()
+            result.samples.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {paths[index % len(paths)]} returned {response.status_code}")
+
+    for path in paths[:concurrency]:
+        await client.get(path)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+async def run(dataset: Dataset, *, requests: int, concurrency: int, seed: int = 0) -> list[Result]:
+    """Load-test the product list, history and stats endpoints; each reports p50/p95/p99 and requests/s.
+
+    The 10k-row product page runs a tenth of ``requests`` twice, with and without
+    ``fast_json_responses``.
+    """
+
+    rng = random.Random(seed)
+    prefix = settings.api_v1_prefix
+    sampled = [rng.choice(dataset.product_ids) for _ in range(100)]
+    scenarios = {
+        "api.list_products[50]": [f"{prefix}/products/?limit=50"],
+        "api.list_products[500+history]": [f"{prefix}/products/?limit=500&include=history"],
+        "api.list_price_history[100]": [f"{prefix}/products/{product_id}/history" for product_id in sampled],
+        "api.list_price_history[1000 expanded]": [
+            f"{prefix}/products/{product_id}/history?limit=1000&expand=true" for product_id in sampled
+        ],
+        "api.price_stats": [f"{prefix}/products/{product_id}/stats" for product_id in sampled],
+        "api.export_price_history": [f"{prefix}/products/{product_id}/history/export" for product_id in sampled],
+    }
+    # 500 products with 20 history runs each: a 10k-row response, encoded by orjson or by Pydantic.
+    large_rows = min(500, len(dataset.product_ids)) * min(LARGE_HISTORY_LIMIT, dataset.history_per_product)
+    large = [f"{prefix}/products/?limit=500&include=history&history_limit={LARGE_HISTORY_LIMIT}"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results = [
+            await load(client, name, paths, requests=requests, concurrency=concurrency)
+            for name, paths in scenarios.items()
+        ]
+        fast_json = settings.fast_json_responses
+        try:
+            for fast in (True, False):
+                settings.fast_json_responses = fast
+                encoder = "orjson" if fast else "pydantic"
+                name = f"api.list_products[{large_rows} rows, {encoder}]"
+                results.append(await load(client, name, large, requests=max(requests // 10, 1), concurrency=concurrency))
+        finally:
+            settings.fast_json_responses = fast_json
+        return results
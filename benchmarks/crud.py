@@ -0,0 +1,187 @@
+"""Microbenchmarks of the CRUD functions behind the hot endpoints and tasks."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import select
+
+from app import alerts, crud
+from app.db.session import SessionLocal
+from app.models import Product
+
+from .data import Dataset
+from .timing import Result, measure
+
+BULK_OBSERVATIONS = 1000
+STATS_PRODUCTS = 100
+
+
+def _price_stats_in_python(runs: list[dict[str, Any]], *, now: datetime) -> dict[str, Any]:
+    """Compute the ``get_price_stats`` fields from a product's runs (newest first) in Python loops."""
+
+    recent_since = now - crud.STATS_RECENT_WINDOW
+    prices = [run["price"] for run in runs]
+    recent: list[tuple[Decimal, int]] = []
+    changes, checks, previous = Decimal(0), 0, None
+    for run in reversed(runs):
+        if run["last_seen_at"] >= recent_since:
+            recent.append((run["price"], run["check_count"]))
+            checks += run["check_count"]
+            if previous:
+                changes += abs(run["price"] - previous) / previous
+        previous = run["price"]
+    recent.sort()
+
+    def percentile(fraction: Decimal) -> Decimal | None:
+        reached = 0
+        for price, count in recent:
+            reached += count
+            if reached >= checks * fraction:
+                return price
+        return None
+
+    current = prices[0] if prices else None
+    median = percentile(Decimal("0.5"))
+    return {
+        "current_price": current,
+        "low_90d": min(prices, default=None),
+        "high_90d": max(prices, default=None),
+        "p10_30d": percentile(Decimal("0.1")),
+        "median_30d": median,
+        "p90_30d": percentile(Decimal("0.9")),
+        "drop_from_median_30d_pct": round((median - current) * 100 / median, 2) if median and current else None,
+        "volatility_30d": round(changes / checks, 6) if checks else None,
+        "samples_30d": checks,
+    }
+
+
+async def run(dataset: Dataset, *, rounds: int, seed: int = 0) -> list[Result]:
+    """Time each CRUD function ``rounds`` times, one fresh session per call as in a request.
+
+    Writes are rolled back instead of committed, so they leave the seeded data as it was
+    and repeated runs stay comparable.
+    """
+
+    rng = random.Random(seed)
+    ids = dataset.product_ids
+    async with SessionLocal() as session:
+        products = (await session.execute(select(Product.id, Product.target_price, Product.target_alerted_at))).all()
+    targets = {product_id: target for product_id, target, _ in products}
+    # Products with an alert outstanding would stay quiet below their target.
+    armed = sorted(product_id for product_id, target, alerted_at in products if target is not None and alerted_at is None)
+    untargeted = sorted(product_id for product_id, target, _ in products if target is None)
+
+    async def get_products(limit: int) -> None:
+        async with SessionLocal() as session:
+            await crud.get_products(session, limit=limit)
+
+    async def get_price_history() -> None:
+        async with SessionLocal() as session:
+            await crud.get_price_history(session, rng.choice(ids), limit=100)
+
+    async def get_recent_price_history() -> None:
+        async with SessionLocal() as session:
+            await crud.get_recent_price_history(session, rng.sample(ids, min(50, len(ids))), 10)
+
+    async def get_price_stats_batch() -> None:
+        async with SessionLocal() as session:
+            await crud.get_price_stats(session, rng.sample(ids, min(STATS_PRODUCTS, len(ids))), now=datetime.utcnow())
+
+    async def get_price_stats_each() -> None:
+        # One query per product instead of the batch.
+        async with SessionLocal() as session:
+            for product_id in rng.sample(ids, min(STATS_PRODUCTS, len(ids))):
+                await crud.get_price_stats(session, [product_id], now=datetime.utcnow())
+
+    async def price_stats_in_python() -> None:
+        # The baseline the SQL statistics replace: fetch each product's history, loop over it.
+        now = datetime.utcnow()
+        async with SessionLocal() as session:
+            for product_id in rng.sample(ids, min(STATS_PRODUCTS, len(ids))):
+                runs = await crud.get_price_history(session, product_id, since=now - crud.STATS_RANGE_WINDOW, until=now)
+                _price_stats_in_python(runs or [], now=now)
+
+    async def insert_price() -> None:
+        async with SessionLocal() as session:
+            await crud.insert_price(session, rng.choice(ids), Decimal(rng.randint(1_000, 50_000)) / 100, commit=False)
+            await session.rollback()
+
+    async def insert_prices_bulk() -> None:
+        observations = [
+            (product_id, Decimal(rng.randint(1_000, 50_000)) / 100, None)
+            for product_id in rng.sample(ids, min(BULK_OBSERVATIONS, len(ids)))
+        ]
+        async with SessionLocal() as session:
+            await crud.insert_prices_bulk(session, observations, commit=False)
+            await session.rollback()
+
+    async def price_updates(alerting: bool) -> None:
+        # Bulk price updates should sustain 100k per minute, about 1,667 ops/s. With alerts
+        # on, every price reaches its product's target and fires an alert; the rollback
+        # re-arms them for the next round. With alerts off, no product has a target.
+        if alerting:
+            observations = [
+                (product_id, targets[product_id] - Decimal("0.01"), None)
+                for product_id in rng.sample(armed, min(BULK_OBSERVATIONS, len(armed)))
+            ]
+        else:
+            observations = [
+                (product_id, Decimal(rng.randint(1_000, 50_000)) / 100, None)
+                for product_id in rng.sample(untargeted, min(BULK_OBSERVATIONS, len(untargeted)))
+            ]
+        async with SessionLocal() as session:
+            await crud.insert_prices_bulk(session, observations, commit=False)
+            await session.rollback()
+            # Deliver the queued alerts to the harness's memory sink, as a commit would.
+            await alerts.dispatch_pending(session)
+
+    stats_products = min(STATS_PRODUCTS, len(ids))
+    return [
+        await measure("crud.get_products[50]", lambda: get_products(50), rounds=rounds),
+        await measure("crud.get_products[500]", lambda: get_products(500), rounds=rounds),
+        await measure("crud.get_price_history[100]", get_price_history, rounds=rounds),
+        await measure("crud.get_recent_price_history[50x10]", get_recent_price_history, rounds=rounds),
+        await measure(
+            f"crud.get_price_stats[batch {stats_products}]",
+            get_price_stats_batch,
+            rounds=rounds,
+            ops_per_sample=stats_products,
+        ),
+        await measure(
+            f"crud.get_price_stats[loop {stats_products}]",
+            get_price_stats_each,
+            rounds=max(rounds // 10, 1),
+            warmup=1,
+            ops_per_sample=stats_products,
+        ),
+        await measure(
+            f"crud.price_stats_in_python[{stats_products}]",
+            price_stats_in_python,
+            rounds=max(rounds // 10, 1),
+            warmup=1,
+            ops_per_sample=stats_products,
+        ),
+        await measure("crud.insert_price", insert_price, rounds=rounds),
+        await measure(
+            f"crud.insert_prices_bulk[{min(BULK_OBSERVATIONS, len(ids))}]",
+            insert_prices_bulk,
+            rounds=max(rounds // 5, 1),
+            ops_per_sample=min(BULK_OBSERVATIONS, len(ids)),
+        ),
+        await measure(
+            f"crud.price_updates[{min(BULK_OBSERVATIONS, len(armed))}, alerts on]",
+            lambda: price_updates(True),
+            rounds=max(rounds // 5, 1),
+            ops_per_sample=min(BULK_OBSERVATIONS, len(armed)),
+        ),
+        await measure(
+            f"crud.price_updates[{min(BULK_OBSERVATIONS, len(untargeted))}, alerts off]",
+            lambda: price_updates(False),
+            rounds=max(rounds // 5, 1),
+            ops_per_sample=min(BULK_OBSERVATIONS, len(untargeted)),
+        ),
+    ]
@@ -0,0 +1,150 @@
+"""Deterministic benchmark data: N products with M price history runs each."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select, text
+
+from app import crud
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import SessionLocal, async_engine
+from app.models import PriceHistory, Product
+
+PLATFORM = "benchmark"
+HISTORY_DAYS = 90
+_CHUNK_PRODUCTS = 1000
+
+_PRODUCT_COLUMNS = [
+    "id",
+    "name",
+    "url",
+    "platform",
+    "target_price",
+    "currency",
+    "last_price",
+    "is_active",
+    "next_check_at",
+    "created_at",
+    "updated_at",
+]
+_RESERVE_IDS = text("SELECT nextval(pg_get_serial_sequence('products', 'id')) FROM generate_series(1, :count)")
+_HISTORY_COLUMNS = ["product_id", "price", "checked_at", "last_seen_at", "check_count"]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Ids of the seeded products and how much history each holds."""
+
+    product_ids: list[int]
+    history_per_product: int
+
+
+def _walk(rng: random.Random, price: Decimal) -> Decimal:
+    step = Decimal(rng.randint(-500, 500)) / 10_000
+    moved = max((price * (1 + step)).quantize(Decimal("0.01")), Decimal("0.01"))
+    # History holds one row per price change, so consecutive runs never share a price.
+    return moved if moved != price else moved + Decimal("0.01")
+
+
+def _product(index: int, product_id: int, opening: Decimal, last_price: Decimal | None, now: datetime) -> tuple:
+    created_at = now - timedelta(days=HISTORY_DAYS, seconds=-index)
+    target = (opening * Decimal("0.9")).quantize(Decimal("0.01")) if index % 2 == 0 else None
+    return (
+        product_id,
+        f"Benchmark product {index}",
+        f"https://bench.example/products/{index}",
+        PLATFORM,
+        target,
+        "USD",
+        last_price,
+        True,
+        now - timedelta(minutes=1),
+        created_at,
+        created_at,
+    )
+
+
+def _runs(rng: random.Random, product_id: int, price: Decimal, runs: int, now: datetime) -> Iterator[tuple]:
+    step = timedelta(days=HISTORY_DAYS) / max(runs, 1)
+    start = now - timedelta(days=HISTORY_DAYS)
+    for index in range(runs):
+        checked_at = start + step * index
+        checks = rng.randint(1, 4)
+        yield product_id, price, checked_at, checked_at + step * (checks - 1) / checks, checks
+        price = _walk(rng, price)
+
+
+async def _ensure_partitions(now: datetime) -> None:
+    async with SessionLocal() as session:
+        existing = set(await partitions.list_partitions(session))
+        month = partitions.month_start(now - timedelta(days=HISTORY_DAYS))
+        while month <= now:
+            if month not in existing:
+                await partitions.create_partition(session, month)
+            month = partitions.add_months(month, 1)
+        await partitions.ensure_partitions(session, now=now, months_ahead=settings.price_history_partitions_ahead)
+        await session.commit()
+
+
+async def seed(products: int, history: int, *, seed: int = 0, reset: bool = False) -> Dataset:
+    """Load ``products`` products with ``history`` price runs each over the last 90 days.
+
+    The same ``seed`` always yields the same rows. Raises ``RuntimeError`` when products
+    already exist, unless ``reset`` truncates the products and history tables first.
+    """
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    async with SessionLocal() as session:
+        if reset:
+            await session.execute(text("TRUNCATE products, price_history, price_history_daily RESTART IDENTITY CASCADE"))
+            await session.commit()
+        elif await session.scalar(select(func.count()).select_from(Product)):
+            raise RuntimeError("The database already holds products; pass reset=True to replace them")
+    await _ensure_partitions(now)
+
+    async with async_engine.begin() as connection:
+        raw = await connection.get_raw_connection()
+        copy = raw.driver_connection.copy_records_to_table
+        for first in range(1, products + 1, _CHUNK_PRODUCTS):
+            count = min(_CHUNK_PRODUCTS, products + 1 - first)
+            ids = (await connection.execute(_RESERVE_IDS, {"count": count})).scalars().all()
+            product_rows = []
+            history_rows = []
+            for index, product_id in enumerate(ids, start=first):
+                opening = Decimal(rng.randint(1_000, 50_000)) / 100
+                runs = list(_runs(rng, product_id, opening, history, now))
+                product_rows.append(_product(index, product_id, opening, runs[-1][1] if runs else None, now))
+                history_rows.extend(runs)
+            await copy(Product.__tablename__, records=product_rows, columns=_PRODUCT_COLUMNS)
+            if history_rows:
+                await copy(PriceHistory.__tablename__, records=history_rows, columns=_HISTORY_COLUMNS)
+
+    async with SessionLocal() as session:
+        await crud.rebuild_price_summaries(session, now=now)
+        await session.commit()
+    # Fresh COPYs leave no planner statistics or visibility map; runs would not be comparable.
+    async with async_engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE products, price_history"))
+
+    async with SessionLocal() as session:
+        product_ids = list((await session.scalars(select(Product.id).order_by(Product.id))).all())
+    return Dataset(product_ids=product_ids, history_per_product=history)
+
+
+async def load() -> Dataset:
+    """Describe data seeded earlier, so benchmarks can rerun without reseeding."""
+
+    async with SessionLocal() as session:
+        product_ids = list((await session.scalars(select(Product.id).order_by(Product.id))).all())
+        runs = await session.scalar(select(func.count()).select_from(PriceHistory))
+    if not product_ids:
+        raise RuntimeError("No products to benchmark; seed the database first")
+    return Dataset(product_ids=product_ids, history_per_product=runs // len(product_ids))
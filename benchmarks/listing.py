@@ -0,0 +1,90 @@
+"""Before/after benchmark of the product listing: full history per product vs keyset pages.
+
+The old ``GET /products`` loaded every product with every price run it ever recorded
+and serialised them all; the current one returns a keyset page and, with
+``include=history``, only each product's latest runs from one windowed query. Both
+report products listed per second. The gap grows with the data, so seed a large
+dataset, e.g. ``python -m benchmarks run --reset --products 5000 --history 200 --suite listing``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app import crud
+from app.core.serialization import dump_json
+from app.db.session import SessionLocal
+from app.models import Product
+from app.schemas import ProductPage, ProductRead
+
+from .data import Dataset
+from .timing import Result, measure
+
+PAGE_SIZE = 50
+FULL_PAGE_SIZE = 500
+HISTORY_LIMIT = 10
+
+_product_list = TypeAdapter(list[ProductRead])
+_product_page = TypeAdapter(ProductPage)
+
+
+async def _list_full_history() -> None:
+    """The listing before keyset pagination: every product with its whole history."""
+
+    async with SessionLocal() as session:
+        statement = select(Product).options(selectinload(Product.price_history)).order_by(Product.created_at.desc())
+        products = (await session.scalars(statement)).all()
+        _product_list.dump_json(_product_list.validate_python(products))
+
+
+async def _list_page(limit: int, after: tuple[datetime, int] | None = None) -> tuple[datetime, int] | None:
+    """Build one ``include=history`` page as the route does; return the next page's keyset."""
+
+    async with SessionLocal() as session:
+        products = [dict(row) for row in await crud.get_products(session, limit=limit, after=after)]
+        history = await crud.get_recent_price_history(session, [product["id"] for product in products], HISTORY_LIMIT)
+    for product in products:
+        product["price_history"] = [dict(entry) for entry in history.get(product["id"], [])]
+    dump_json({"items": products, "next_cursor": None}, _product_page)
+    if len(products) < limit:
+        return None
+    return products[-1]["created_at"], products[-1]["id"]
+
+
+async def _list_all_pages() -> None:
+    after = await _list_page(FULL_PAGE_SIZE)
+    while after is not None:
+        after = await _list_page(FULL_PAGE_SIZE, after)
+
+
+async def run(dataset: Dataset, *, rounds: int) -> list[Result]:
+    """Time the old full-history listing against one keyset page and against paging through everything."""
+
+    products = len(dataset.product_ids)
+    page = min(PAGE_SIZE, products)
+    return [
+        await measure(
+            f"listing.before[{products} + full history]",
+            _list_full_history,
+            rounds=max(rounds // 10, 1),
+            warmup=1,
+            ops_per_sample=products,
+        ),
+        await measure(
+            f"listing.after[page {page} + history {HISTORY_LIMIT}]",
+            lambda: _list_page(PAGE_SIZE),
+            rounds=rounds,
+            ops_per_sample=page,
+        ),
+        await measure(
+            f"listing.after[all {products}, pages of {FULL_PAGE_SIZE}]",
+            _list_all_pages,
+            rounds=max(rounds // 10, 1),
+            warmup=1,
+            ops_per_sample=products,
+        ),
+    ]
@@ -0,0 +1,150 @@
+"""Benchmark of the scrape pipeline in process: beat fan-out, batch scrapes and bulk writes."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import update
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal, async_engine, build_async_engine
+from app.models import Product
+from app.schemas.product import ProductMetadata
+from app.scrapers import PageValidators
+from app.scrapers.base import BaseScraper
+from app.scrapers.registry import register_scraper
+from app.tasks.celery_app import celery_app
+from app.tasks.price_tracking import enqueue_recurring_scrape, track_products_batch
+from app.tasks.runtime import run_async
+
+from .data import PLATFORM, Dataset
+from .timing import Result
+
+OVERHEAD_TASKS = 200
+
+class BenchmarkScraper(BaseScraper):
+    """Answers instantly: a third of pages unchanged, the rest with a nearby price."""
+
+    def __init__(self, seed: int) -> None:
+        super().__init__(PLATFORM)
+        self._rng = random.Random(seed)
+
+    async def fetch_price(self, product: ProductMetadata, validators: PageValidators | None = None) -> dict[str, Any]:
+        fresh = PageValidators(etag=f'"{self._rng.random()}"')
+        if validators is not None and validators.etag and self._rng.random() < 1 / 3:
+            return {"unchanged": True, "validators": validators}
+        price = Decimal(self._rng.randint(1_000, 50_000)) / 100
+        return {"unchanged": False, "validators": fresh, "price": price, "currency": "USD"}
+
+
+async def _make_all_due() -> None:
+    async with SessionLocal() as session:
+        await session.execute(update(Product).values(next_check_at=Product.created_at))
+        await session.commit()
+
+
+def _published_batches() -> list[list[int]]:
+    batches = []
+    with celery_app.connection_for_read() as connection:
+        queue = connection.SimpleQueue("price_tracking")
+        try:
+            while True:
+                try:
+                    message = queue.get(block=False)
+                except queue.Empty:
+                    break
+                (product_ids,), _, _ = message.payload
+                batches.append(product_ids)
+                message.ack()
+        finally:
+            queue.close()
+    return batches
+
+
+async def _read_scrape_state(product_id: int, session_factory: Callable[[], Any] = SessionLocal) -> None:
+    # The smallest database work a scrape task does.
+    async with session_factory() as session:
+        await crud.get_scrape_states(session, [product_id])
+
+
+async def _read_scrape_state_on_fresh_engine(product_id: int) -> None:
+    engine = build_async_engine(name="per-task")
+    try:
+        await _read_scrape_state(product_id, lambda: SessionLocal(bind=engine))
+    finally:
+        await engine.dispose()
+
+
+def _time_calls(name: str, call: Callable[[int], None], product_ids: list[int]) -> Result:
+    call(product_ids[0])
+    result = Result(name)
+    for product_id in product_ids:
+        started = time.perf_counter()
+        call(product_id)
+        result.samples.append(time.perf_counter() - started)
+    return result
+
+
+def task_overhead(dataset: Dataset, *, seed: int = 0) -> list[Result]:
+    """Time one small task run the old way, ``asyncio.run`` with a fresh engine, and with ``run_async``.
+
+    A fresh loop cannot reuse connections pooled on an earlier one, so before the
+    per-worker runtime every task built an engine and connected anew.
+    """
+
+    rng = random.Random(seed)
+    product_ids = [rng.choice(dataset.product_ids) for _ in range(OVERHEAD_TASKS)]
+    return [
+        _time_calls(
+            "tasks.overhead[asyncio.run + engine]",
+            lambda product_id: asyncio.run(_read_scrape_state_on_fresh_engine(product_id)),
+            product_ids,
+        ),
+        _time_calls("tasks.overhead[run_async]", lambda product_id: run_async(_read_scrape_state(product_id)), product_ids),
+    ]
+
+
+def run(dataset: Dataset, *, rounds: int, seed: int = 0) -> list[Result]:
+    """Time per-task overhead, then the beat fan-out and the batch scrapes it queues, over every product.
+
+    Each round marks all products due and runs ``enqueue_recurring_scrape``, which
+    publishes its batches to an in-memory broker. Those are then drained and run in
+    process with ``Task.apply``, as eager mode would, covering scraping, bulk price
+    writes, alerts and rescheduling. Eager mode itself cannot run the fan-out, whose
+    ``delay`` calls happen inside the worker's event loop. Must be called outside an
+    event loop.
+    """
+
+    register_scraper(BenchmarkScraper(seed))
+    settings.scrape_platform_rate_limits = {**settings.scrape_platform_rate_limits, PLATFORM: 1_000_000.0}
+    settings.scrape_rate_limit_burst = max(settings.scrape_rate_limit_burst, 1_000_000)
+    celery_app.conf.update(broker_url="memory://", task_eager_propagates=True)
+
+    overhead = task_overhead(dataset, seed=seed)
+    products = len(dataset.product_ids)
+    fan_out = Result(f"tasks.enqueue_recurring_scrape[{products}]", ops_per_sample=products)
+    batch = Result(f"tasks.track_products_batch[{settings.scrape_batch_size}]", ops_per_sample=settings.scrape_batch_size)
+    pipeline = Result(f"tasks.pipeline[{products}]", ops_per_sample=products)
+    try:
+        for _ in range(rounds):
+            run_async(_make_all_due())
+            started = time.perf_counter()
+            outcome = enqueue_recurring_scrape.apply().get()
+            fan_out.samples.append(time.perf_counter() - started)
+            if outcome["queued"] != products:
+                raise RuntimeError(f"Expected {products} due products, queued {outcome['queued']}")
+            for product_ids in _published_batches():
+                batch_started = time.perf_counter()
+                track_products_batch.apply(args=(product_ids,)).get()
+                if len(product_ids) == settings.scrape_batch_size:
+                    batch.samples.append(time.perf_counter() - batch_started)
+            pipeline.samples.append(time.perf_counter() - started)
+    finally:
+        run_async(async_engine.dispose())
+    return [*overhead, fan_out, batch, pipeline]
@@ -0,0 +1,75 @@
+"""Timing helpers shared by the benchmark suites."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``values``, which must be sorted."""
+
+    if not values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return values[rank - 1]
+
+
+@dataclass
+class Result:
+    """Latencies of one benchmark, with the operations each sample covered.
+
+    ``wall_seconds`` is set by load tests, whose samples overlap; throughput is then
+    measured against wall time instead of the sum of the samples.
+    """
+
+    name: str
+    samples: list[float] = field(default_factory=list)
+    ops_per_sample: int = 1
+    wall_seconds: float | None = None
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.samples)
+        elapsed = self.wall_seconds if self.wall_seconds is not None else sum(latencies)
+        ops = len(latencies) * self.ops_per_sample
+        return {
+            "name": self.name,
+            "rounds": len(latencies),
+            "ops_per_round": self.ops_per_sample,
+            "min_ms": round(latencies[0] * 1000, 3) if latencies else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "ops_per_s": round(ops / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        return (
+            f"{self.name:<40} p50 {summary['p50_ms']:>9.2f} ms  p95 {summary['p95_ms']:>9.2f} ms"
+            f"  p99 {summary['p99_ms']:>9.2f} ms  {summary['ops_per_s']:>11,.1f} ops/s"
+        )
+
+
+async def measure(
+    name: str,
+    operation: Callable[[], Awaitable[Any]],
+    *,
+    rounds: int,
+    warmup: int = 3,
+    ops_per_sample: int = 1,
+) -> Result:
+    """Await ``operation`` ``warmup`` times untimed, then ``rounds`` times timed one by one."""
+
+    for _ in range(warmup):
+        await operation()
+    result = Result(name, ops_per_sample=ops_per_sample)
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await operation()
+        result.samples.append(time.perf_counter() - started)
+    return result
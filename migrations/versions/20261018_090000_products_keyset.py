@@ -0,0 +1,19 @@
+"""Index products for keyset pagination on (created_at, id)."""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_090000_products_keyset"
+down_revision = "20241006_202110_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_products_created_at_id", "products", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_created_at_id", table_name="products")
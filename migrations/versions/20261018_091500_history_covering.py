@@ -0,0 +1,26 @@
+"""Covering index for per-product price history range scans."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_091500_history_covering"
+down_revision = "20261018_090000_products_keyset"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_price_history_product_checked",
+        "price_history",
+        ["product_id", sa.text("checked_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["price"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_price_history_product_checked", table_name="price_history")
@@ -0,0 +1,31 @@
+"""Per-product next_check_at for adaptive scrape scheduling."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_093000_next_check_at"
+down_revision = "20261018_091500_history_covering"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column("next_check_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_products_next_check_at",
+        "products",
+        ["next_check_at"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_next_check_at", table_name="products")
+    op.drop_column("products", "next_check_at")
@@ -0,0 +1,26 @@
+"""Page validators for conditional scraping and price dedup."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_094500_page_validators"
+down_revision = "20261018_093000_next_check_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("page_etag", sa.String(length=255), nullable=True))
+    op.add_column("products", sa.Column("page_last_modified", sa.String(length=64), nullable=True))
+    op.add_column("products", sa.Column("price_content_hash", sa.String(length=64), nullable=True))
+    op.add_column("products", sa.Column("price_confirmed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("products", "price_confirmed_at")
+    op.drop_column("products", "price_content_hash")
+    op.drop_column("products", "page_last_modified")
+    op.drop_column("products", "page_etag")
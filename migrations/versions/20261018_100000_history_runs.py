@@ -0,0 +1,89 @@
+"""Store price history as runs of unchanged prices and compact existing rows."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_100000_history_runs"
+down_revision = "20261018_094500_page_validators"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("price_history", sa.Column("last_seen_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "price_history",
+        sa.Column("check_count", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+    # Group consecutive equal prices per product into runs, keep each run's first row
+    # stretched to the run's last check, and delete the rest.
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE price_history_runs ON COMMIT DROP AS
+        WITH marked AS (
+            SELECT
+                id,
+                product_id,
+                checked_at,
+                CASE WHEN price IS DISTINCT FROM lag(price) OVER w THEN 1 ELSE 0 END AS starts_run
+            FROM price_history
+            WINDOW w AS (PARTITION BY product_id ORDER BY checked_at, id)
+        ),
+        numbered AS (
+            SELECT
+                id,
+                product_id,
+                checked_at,
+                sum(starts_run) OVER (PARTITION BY product_id ORDER BY checked_at, id) AS run
+            FROM marked
+        )
+        SELECT
+            (array_agg(id ORDER BY checked_at, id))[1] AS keep_id,
+            max(checked_at) AS last_seen_at,
+            count(*) AS check_count
+        FROM numbered
+        GROUP BY product_id, run
+        """
+    )
+    op.execute(
+        """
+        UPDATE price_history
+        SET last_seen_at = runs.last_seen_at, check_count = runs.check_count
+        FROM price_history_runs AS runs
+        WHERE price_history.id = runs.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM price_history
+        WHERE NOT EXISTS (SELECT 1 FROM price_history_runs AS runs WHERE runs.keep_id = price_history.id)
+        """
+    )
+    op.alter_column("price_history", "last_seen_at", nullable=False, server_default=sa.func.now())
+
+    op.drop_index("ix_price_history_product_checked", table_name="price_history")
+    op.create_index(
+        "ix_price_history_product_checked",
+        "price_history",
+        ["product_id", sa.text("checked_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["price", "last_seen_at", "check_count"],
+    )
+
+
+def downgrade() -> None:
+    # Compacted runs are kept as single rows; the individual checks are not restored.
+    op.drop_index("ix_price_history_product_checked", table_name="price_history")
+    op.create_index(
+        "ix_price_history_product_checked",
+        "price_history",
+        ["product_id", sa.text("checked_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["price"],
+    )
+    op.drop_column("price_history", "check_count")
+    op.drop_column("price_history", "last_seen_at")
@@ -0,0 +1,127 @@
+"""Range-partition price history by month and add the daily rollup table.
+
+The existing rows are copied into the partitioned table, which rewrites the whole
+history once; run it during a maintenance window on large installations.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_103000_history_parts"
+down_revision = "20261018_100000_history_runs"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created past the current month; the maintenance task keeps extending them.
+MONTHS_AHEAD = 3
+COLUMNS = "id, product_id, price, checked_at, last_seen_at, check_count"
+
+
+def _add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _history_columns(id_default: str) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.Integer(), nullable=False, server_default=sa.text(id_default)),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("checked_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("check_count", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    ]
+
+
+def _create_history_indexes() -> None:
+    op.create_index("ix_price_history_id", "price_history", ["id"], unique=False)
+    op.create_index(
+        "ix_price_history_product_checked",
+        "price_history",
+        ["product_id", sa.text("checked_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["price", "last_seen_at", "check_count"],
+    )
+
+
+def _retire_history_table(name: str) -> None:
+    """Rename the current table out of the way, freeing its index and constraint names."""
+
+    op.drop_index("ix_price_history_product_checked", table_name="price_history")
+    op.drop_index("ix_price_history_id", table_name="price_history")
+    op.rename_table("price_history", name)
+    op.execute(f"ALTER TABLE {name} RENAME CONSTRAINT price_history_pkey TO {name}_pkey")
+    op.execute(f"ALTER TABLE {name} RENAME CONSTRAINT price_history_product_id_fkey TO {name}_product_id_fkey")
+
+
+def upgrade() -> None:
+    _retire_history_table("price_history_unpartitioned")
+
+    op.create_table(
+        "price_history",
+        *_history_columns("nextval('price_history_id_seq'::regclass)"),
+        sa.PrimaryKeyConstraint("id", "checked_at", name="price_history_pkey"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        postgresql_partition_by="RANGE (checked_at)",
+    )
+    op.execute("ALTER SEQUENCE price_history_id_seq OWNED BY price_history.id")
+    _create_history_indexes()
+
+    # Partition the months that hold history plus the next few; anything else lands in the default.
+    months = {
+        datetime(row.year, row.month, 1)
+        for row in op.get_bind().scalars(
+            sa.text("SELECT DISTINCT date_trunc('month', checked_at) FROM price_history_unpartitioned")
+        )
+    }
+    now = datetime.utcnow()
+    current = datetime(now.year, now.month, 1)
+    months.update(_add_months(current, offset) for offset in range(MONTHS_AHEAD + 1))
+    for month in sorted(months):
+        op.execute(
+            f"CREATE TABLE price_history_{month:%Y%m} PARTITION OF price_history"
+            f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+    op.execute("CREATE TABLE price_history_default PARTITION OF price_history DEFAULT")
+
+    op.execute(f"INSERT INTO price_history ({COLUMNS}) SELECT {COLUMNS} FROM price_history_unpartitioned")
+    op.drop_table("price_history_unpartitioned")
+
+    op.create_table(
+        "price_history_daily",
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("open_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("close_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("min_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("max_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("avg_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("first_checked_at", sa.DateTime(), nullable=False),
+        sa.Column("last_checked_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("product_id", "day"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+    )
+
+
+def downgrade() -> None:
+    # History already rolled up into daily summaries is not restored.
+    op.drop_table("price_history_daily")
+
+    _retire_history_table("price_history_partitioned")
+    op.create_table(
+        "price_history",
+        *_history_columns("nextval('price_history_id_seq'::regclass)"),
+        sa.PrimaryKeyConstraint("id", name="price_history_pkey"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+    )
+    op.execute("ALTER SEQUENCE price_history_id_seq OWNED BY price_history.id")
+    _create_history_indexes()
+
+    op.execute(f"INSERT INTO price_history ({COLUMNS}) SELECT {COLUMNS} FROM price_history_partitioned")
+    op.drop_table("price_history_partitioned")
@@ -0,0 +1,38 @@
+"""Add running price summary columns to products.
+
+Existing products start without a summary; run ``python -m app.cli rebuild-stats``
+after upgrading to backfill it from the stored history.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_110000_price_summary"
+down_revision = "20261018_103000_history_parts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("lowest_price", sa.Numeric(10, 2), nullable=True))
+    op.add_column("products", sa.Column("highest_price", sa.Numeric(10, 2), nullable=True))
+    op.add_column("products", sa.Column("price_changed_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "products",
+        sa.Column("recent_price_total", sa.Numeric(14, 2), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "products",
+        sa.Column("recent_check_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "recent_check_count")
+    op.drop_column("products", "recent_price_total")
+    op.drop_column("products", "price_changed_at")
+    op.drop_column("products", "highest_price")
+    op.drop_column("products", "lowest_price")
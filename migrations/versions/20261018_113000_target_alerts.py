@@ -0,0 +1,25 @@
+"""Track which products have an outstanding target price alert."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_113000_target_alerts"
+down_revision = "20261018_110000_price_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("target_alerted_at", sa.DateTime(), nullable=True))
+    # Products already at or below their target count as alerted, so upgrading sends nothing.
+    op.execute(
+        "UPDATE products SET target_alerted_at = now() AT TIME ZONE 'utc'"
+        " WHERE target_price IS NOT NULL AND last_price <= target_price"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "target_alerted_at")
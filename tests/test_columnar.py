@@ -0,0 +1,81 @@
+"""Parquet export and import through stand-ins for PostgreSQL's CSV COPY streams."""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterator
+from decimal import Decimal
+from pathlib import Path
+
+import pyarrow.parquet as pq
+from sqlalchemy import Column, Integer, MetaData, Numeric, String, Table
+
+from app import columnar
+
+THINGS = Table(
+    "things",
+    MetaData(),
+    Column("id", Integer, nullable=False),
+    Column("name", String),
+    Column("price", Numeric(10, 2)),
+)
+
+
+class StubCopy:
+    """One ``COPY`` stream: yields ``rows`` as PostgreSQL CSV, one row per chunk, and keeps what is written."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.written = bytearray()
+
+    def __enter__(self) -> StubCopy:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for row in self.rows:
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerow(row)
+            yield memoryview(buffer.getvalue().encode())
+
+    def write(self, data: memoryview) -> None:
+        self.written += data
+
+
+class StubConnection:
+    def __init__(self, rows: list[tuple] | None = None) -> None:
+        self.copy_stream = StubCopy(rows or [])
+
+    def cursor(self) -> StubConnection:
+        return self
+
+    def __enter__(self) -> StubConnection:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def copy(self, statement: object) -> StubCopy:
+        return self.copy_stream
+
+
+def test_round_trip_keeps_newlines_and_quotes_across_blocks(tmp_path: Path) -> None:
+    rows = [(index, f'Kettle "{index}"\nbrushed steel, 1.7l', f"{index}.99") for index in range(2000)]
+    path = tmp_path / "things.parquet"
+
+    exported = columnar.export_table(
+        StubConnection(rows), "things", columnar.arrow_schema(THINGS), path, block_bytes=4096
+    )
+    assert exported.rows == len(rows)
+    assert pq.ParquetFile(path).metadata.num_row_groups > 1
+
+    connection = StubConnection()
+    imported = columnar.import_file(connection, path, "things", batch_rows=500)
+    assert imported.rows == len(rows)
+    copied = list(csv.reader(io.StringIO(connection.copy_stream.written.decode())))
+    assert [(int(id), name, Decimal(price)) for id, name, price in copied] == [
+        (index, name, Decimal(price)) for index, name, price in rows
+    ]
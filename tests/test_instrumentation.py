@@ -0,0 +1,36 @@
+"""Celery worker metrics serving."""
+
+from __future__ import annotations
+
+import logging
+import socket
+
+import pytest
+
+from app.core.config import settings
+from app.tasks import instrumentation
+
+
+def test_worker_metrics_port_is_off_by_default() -> None:
+    assert type(settings).model_fields["metrics_worker_port"].default is None
+
+
+def test_taken_port_is_logged_not_raised(caplog: pytest.LogCaptureFixture) -> None:
+    with socket.socket() as taken:
+        taken.bind(("", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        with caplog.at_level(logging.WARNING, logger=instrumentation.logger.name):
+            instrumentation._serve(port)
+
+    assert f"Cannot serve worker metrics on port {port}" in caplog.text
+
+
+def test_pool_process_metrics_skip_processes_without_a_pool_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    served = []
+    monkeypatch.setattr(settings, "metrics_worker_port", 9808)
+    monkeypatch.setattr(instrumentation, "_serve", served.append)
+
+    instrumentation._serve_pool_process_metrics()
+
+    assert served == []
@@ -0,0 +1,134 @@
+"""Request profiling middleware and slow query logging."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import profiling
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+TOKEN = "s3cret-profiling-token"
+
+
+async def slow_endpoint(request: object) -> JSONResponse:
+    await asyncio.sleep(0.01)
+    return JSONResponse({"status": "ok"})
+
+
+def profiled_client() -> httpx.AsyncClient:
+    routes = [Route("/products/slow", slow_endpoint, methods=["GET", "POST"])]
+    app = profiling.ProfilingMiddleware(Starlette(routes=routes))
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture(autouse=True)
+def unsampled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "profiling_dir", None)
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+
+
+async def test_profile_header_returns_html_profile() -> None:
+    async with profiled_client() as client:
+        response = await client.get("/products/slow", headers={"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "pyinstrument" in response.text
+    assert "slow_endpoint" in response.text
+
+
+async def test_unprofiled_requests_pass_through() -> None:
+    async with profiled_client() as client:
+        response = await client.get("/products/slow")
+
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.parametrize(
+    ("method", "header", "token"),
+    [
+        ("GET", "wrong-token", TOKEN),
+        ("GET", "", TOKEN),
+        ("GET", TOKEN, None),
+        ("POST", TOKEN, TOKEN),
+    ],
+)
+async def test_profile_header_needs_the_token_and_a_safe_method(
+    monkeypatch: pytest.MonkeyPatch,
+    method: str,
+    header: str,
+    token: str | None,
+) -> None:
+    monkeypatch.setattr(settings, "profiling_token", token)
+    async with profiled_client() as client:
+        response = await client.request(method, "/products/slow", headers={"X-Profile": header})
+
+    assert response.json() == {"status": "ok"}
+
+
+async def test_sampled_request_is_written_to_profiling_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "profiling_dir", tmp_path)
+    async with profiled_client() as client:
+        response = await client.get("/products/slow")
+
+    assert response.json() == {"status": "ok"}
+    [profile] = tmp_path.glob("*-GET-products-slow-*ms.html")
+    assert "slow_endpoint" in profile.read_text()
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profiling.log_slow_queries(engine)
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    await engine.dispose()
+
+
+async def test_slow_query_is_logged_with_parameters_and_plan(
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    with caplog.at_level(logging.WARNING, logger=profiling.logger.name):
+        async with engine.connect() as connection:
+            rows = await connection.execute(text("SELECT id FROM products WHERE name = :name"), {"name": "kettle"})
+
+    assert rows.all() == []
+    [record] = [record for record in caplog.records if "FROM products" in record.getMessage()]
+    message = record.getMessage()
+    assert message.startswith("Slow query took")
+    assert "Parameters: ('kettle',)" in message
+    assert "EXPLAIN failed" not in message
+    assert "OpenRead" in message
+
+
+async def test_fast_queries_are_not_logged(
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(settings, "slow_query_ms", 60_000)
+    with caplog.at_level(logging.WARNING, logger=profiling.logger.name):
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT id FROM products"))
+
+    assert not caplog.records
@@ -0,0 +1,177 @@
+"""ScrapeExecutor against a local stub HTTP server."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.product import ProductMetadata
+from app.scrapers import CircuitOpenError, ScrapeExecutor, ratelimit
+from app.scrapers.circuit import CircuitBreaker
+from app.scrapers.http import close_http_client
+
+pytestmark = pytest.mark.anyio
+
+# Every stub response takes this long, like a slow product page.
+RESPONSE_DELAY = 0.05
+
+
+class StubShop:
+    """Keep-alive HTTP/1.1 server answering ``/products/<n>`` with a price of ``n``.99."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.port = 0
+
+    def page(self, path: str) -> tuple[int, bytes]:
+        number = path.rsplit("/", 1)[-1]
+        if number == "missing":
+            return 200, b"<html><title>No price here</title></html>"
+        if number == "down":
+            return 503, b"unavailable"
+        return 200, f'<meta property="product:price:amount" content="{number}.99">'.encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                self.requests += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(RESPONSE_DELAY)
+                finally:
+                    self.in_flight -= 1
+                status, body = self.page(request_line.split()[1].decode())
+                writer.write(
+                    f"HTTP/1.1 {status} Stub\r\nContent-Type: text/html\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def product(self, product_id: int, page: str | int | None = None, *, platform: str) -> ProductMetadata:
+        return ProductMetadata(
+            id=product_id,
+            url=f"http://127.0.0.1:{self.port}/products/{product_id if page is None else page}",
+            platform=platform,
+        )
+
+
+@asynccontextmanager
+async def stub_shop() -> AsyncIterator[StubShop]:
+    shop = StubShop()
+    server = await asyncio.start_server(shop.handle, "127.0.0.1", 0)
+    shop.port = server.sockets[0].getsockname()[1]
+    try:
+        yield shop
+    finally:
+        await close_http_client()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use local, effectively unlimited token buckets instead of Redis."""
+
+    monkeypatch.setattr(settings, "scrape_rate_limit_per_second", 1_000_000.0)
+    monkeypatch.setattr(settings, "scrape_rate_limit_burst", 1_000_000)
+    monkeypatch.setattr(ratelimit, "_limiter", ratelimit.PlatformRateLimiter(shared=False))
+
+
+async def test_run_returns_prices_and_errors_in_input_order() -> None:
+    async with stub_shop() as shop:
+        products = [
+            shop.product(1, platform="stub-order"),
+            shop.product(2, "missing", platform="stub-order"),
+            shop.product(3, platform="stub-order"),
+        ]
+        results = await ScrapeExecutor(per_host_limit=10).run(products)
+
+    assert results[0]["price"] == Decimal("1.99")
+    assert isinstance(results[1], ValueError)
+    assert results[2]["price"] == Decimal("3.99")
+    assert results[2]["unchanged"] is False
+
+
+async def test_scrapes_concurrently_within_the_executor_limit() -> None:
+    count, concurrency = 200, 20
+    async with stub_shop() as shop:
+        products = [shop.product(index, platform="stub-throughput") for index in range(count)]
+        started = time.perf_counter()
+        results = await ScrapeExecutor(concurrency=concurrency, per_host_limit=count).run(products)
+        elapsed = time.perf_counter() - started
+
+    assert [result["price"] for result in results] == [Decimal(f"{index}.99") for index in range(count)]
+    assert shop.peak_in_flight == concurrency
+    # Ideal is concurrency / RESPONSE_DELAY = 400 products/s; serial scraping manages 20.
+    assert count / elapsed > 100, f"{count / elapsed:.0f} products/s"
+
+
+async def test_per_host_limit_caps_requests_to_one_host() -> None:
+    async with stub_shop() as shop:
+        products = [shop.product(index, platform="stub-host") for index in range(30)]
+        await ScrapeExecutor(concurrency=30, per_host_limit=3).run(products)
+
+    assert shop.peak_in_flight == 3
+    assert shop.requests == 30
+
+
+async def test_open_circuit_stops_requests_to_a_failing_platform() -> None:
+    async with stub_shop() as shop:
+        products = [shop.product(index, "down", platform="stub-down") for index in range(20)]
+        results = await ScrapeExecutor(concurrency=1, per_host_limit=1).run(products)
+
+    threshold = settings.scrape_breaker_failure_threshold
+    assert shop.requests == threshold
+    assert all(isinstance(result, CircuitOpenError) for result in results[threshold:])
+
+
+async def test_half_open_circuit_lets_one_trial_through(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "scrape_breaker_cooldown_seconds", 1)
+    threshold = settings.scrape_breaker_failure_threshold
+    async with stub_shop() as shop:
+        failing = [shop.product(index, "down", platform="stub-half-open") for index in range(threshold)]
+        await ScrapeExecutor(concurrency=1, per_host_limit=1).run(failing)
+        await asyncio.sleep(1.1)
+
+        healthy = [shop.product(index, platform="stub-half-open") for index in range(10)]
+        results = await ScrapeExecutor(per_host_limit=10).run(healthy)
+        assert shop.requests == threshold + 1
+        assert sum(isinstance(result, CircuitOpenError) for result in results) == 9
+
+        # The trial succeeded, so the circuit is closed again.
+        results = await ScrapeExecutor(per_host_limit=10).run(healthy)
+        assert not any(isinstance(result, BaseException) for result in results)
+
+
+def test_failed_trial_reopens_the_circuit() -> None:
+    breaker = CircuitBreaker("stub-trial", threshold=2, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    breaker._open_until = time.monotonic()
+    assert breaker.allow() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_failure()
+    breaker.release()
+    with pytest.raises(CircuitOpenError) as opened:
+        breaker.check()
+    assert opened.value.retry_after > 59